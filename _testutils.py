@@ -0,0 +1,216 @@
+"""
+Shared helpers for the local test scripts
+One pooled HTTP session, a memoized backend health check and an opt-in
+on-disk cache of generation results
+"""
+import hashlib
+import json
+import os
+import struct
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# JSON codec: orjson when installed, stdlib json otherwise
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps(obj) -> bytes:
+        """Serialize to compact JSON bytes"""
+        return orjson.dumps(obj)
+
+    def dumps_pretty(obj) -> str:
+        """Serialize to indented JSON for console output"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    loads = json.loads
+
+    def dumps(obj) -> bytes:
+        """Serialize to compact JSON bytes"""
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def dumps_pretty(obj) -> str:
+        """Serialize to indented JSON for console output"""
+        return json.dumps(obj, indent=2)
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8000")
+
+# Endpoint URLs, built once
+HEALTH_URL = f"{BACKEND_URL}/health"
+BATCH_HEALTH_URL = f"{BACKEND_URL}/api/batch/health"
+TEMPLATES_URL = f"{BACKEND_URL}/api/templates"
+GENERATE_URL = f"{BACKEND_URL}/api/templates/generate"
+UPLOAD_URL = f"{BACKEND_URL}/api/templates/upload"
+
+# Retry with backoff while the backend is still starting. Refused connections
+# are retried for every method (nothing reached the server); gateway errors
+# only for GET/HEAD, because upload and generate POSTs are not idempotent.
+# Read timeouts are never retried.
+RETRY = Retry(
+    total=3,
+    read=0,
+    backoff_factor=0.3,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=frozenset(["GET", "HEAD"]),
+    raise_on_status=False
+)
+
+# One keep-alive connection pool shared by every script in the process
+session = requests.Session()
+adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=RETRY)
+session.mount("http://", adapter)
+session.mount("https://", adapter)
+
+# Last health result per health URL: (checked_at, healthy)
+HEALTH_TTL_SECONDS = 5.0
+_health_cache = {}
+
+
+def check_health(url: str = HEALTH_URL, ttl: float = HEALTH_TTL_SECONDS) -> bool:
+    """
+    Check that the backend /health endpoint responds with 200
+
+    The result is reused for ttl seconds, so chained checks in one run
+    only hit the backend once.
+
+    Args:
+        url: Backend health endpoint URL
+        ttl: Seconds to reuse the last result
+
+    Returns:
+        True if the backend is healthy
+    """
+    now = time.monotonic()
+    cached = _health_cache.get(url)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+
+    try:
+        healthy = session.get(url, timeout=5).status_code == 200
+    except requests.RequestException:
+        healthy = False
+
+    _health_cache[url] = (now, healthy)
+    return healthy
+
+
+def wait_for_poster(poll_endpoint: str, timeout: float = 120, interval: float = 1.0) -> str:
+    """
+    Poll a template generation job until its poster is ready
+
+    /api/templates/generate only queues the job; the poster URL shows up
+    in the job's results once a worker has rendered and uploaded it.
+
+    Args:
+        poll_endpoint: Job status path returned by the generate call
+        timeout: Seconds to wait before giving up
+        interval: Seconds between polls
+
+    Returns:
+        URL of the generated poster
+
+    Raises:
+        RuntimeError if the job fails, TimeoutError if it doesn't finish
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = session.get(f"{BACKEND_URL}{poll_endpoint}", timeout=10)
+        response.raise_for_status()
+        job = loads(response.content)
+        for result in job["results"]:
+            if result["status"] == "completed":
+                return result["url"]
+            raise RuntimeError(result["error"] or "generation failed")
+        if job["status"] == "failed":
+            raise RuntimeError("generation failed")
+        time.sleep(interval)
+    raise TimeoutError(f"Job not finished after {timeout:.0f}s: {poll_endpoint}")
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def png_dimensions(header: bytes):
+    """
+    Read width and height from the IHDR chunk of a PNG
+
+    Args:
+        header: At least the first 24 bytes of the file
+
+    Returns:
+        (width, height), or None if the data is not a PNG
+    """
+    if len(header) < 24 or header[:8] != PNG_SIGNATURE:
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def fetch_png(url: str, timeout: float = 10):
+    """
+    Check that a poster URL serves a PNG
+
+    Streams the response and reads only the signature and IHDR header.
+
+    Returns:
+        (url, size in bytes from Content-Length or None, (width, height))
+
+    Raises:
+        requests.RequestException on HTTP errors, ValueError if not a PNG
+    """
+    with session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        header = response.raw.read(24, decode_content=True)
+        size = response.headers.get("Content-Length")
+    dimensions = png_dimensions(header)
+    if dimensions is None:
+        raise ValueError(f"Not a PNG: {url}")
+    return url, int(size) if size else None, dimensions
+
+
+# Generation results keyed by a hash of the request payload
+GEN_CACHE_PATH = Path(".gen_cache.json")
+GEN_CACHE_TTL_SECONDS = 3600
+
+
+def _payload_key(payload: dict) -> str:
+    """Stable hash of a request payload"""
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _read_gen_cache() -> dict:
+    """Load the generation cache file (empty if missing or unreadable)"""
+    if not GEN_CACHE_PATH.exists():
+        return {}
+    try:
+        return json.loads(GEN_CACHE_PATH.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+
+
+def load_cached_generation(payload: dict, ttl: float = GEN_CACHE_TTL_SECONDS):
+    """
+    Return a cached generation result for an identical payload
+
+    The cache does not know about template changes, so callers should only
+    use it when they explicitly want to skip regeneration.
+
+    Returns:
+        The stored response dict, or None if missing or older than ttl
+    """
+    entry = _read_gen_cache().get(_payload_key(payload))
+    if entry and time.time() - entry["t"] < ttl:
+        return entry["result"]
+    return None
+
+
+def store_generation(payload: dict, result: dict):
+    """Remember a successful generation result for this payload"""
+    cache = _read_gen_cache()
+    cache[_payload_key(payload)] = {"result": result, "t": time.time()}
+    GEN_CACHE_PATH.write_text(json.dumps(cache), encoding="utf-8")
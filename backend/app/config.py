@@ -32,6 +32,8 @@ class Settings(BaseSettings):
     # RedPanda / Kafka Configuration
     redpanda_broker: str = "localhost:19092"
     redpanda_schema_registry: str = "http://localhost:18081"
+    # Producer batch size; keep well below the broker's 1 MiB message/batch limit
+    redpanda_max_batch_size: int = 262144
     
     # PostgreSQL Configuration
     postgres_host: str = "localhost"
@@ -50,6 +52,7 @@ class Settings(BaseSettings):
     batch_size: int = 10  # Increased to 10 parallel jobs
     max_concurrent_jobs: int = 5
     taskiq_workers: int = 4  # Number of TaskIQ worker processes
+    render_concurrency: int = 10  # Max concurrent Playwright pages per process
 
     class Config:
         env_file = ".env"
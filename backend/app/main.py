@@ -31,6 +31,7 @@ from app.services.redpanda_client import redpanda_client
 from app.services.job_manager import job_manager
 from app.services.taskiq_broker import startup_broker, shutdown_broker
 from app.services.sse_manager import sse_manager
+from app.services.topmate_client import close_client as close_topmate_client
 
 # Configure structlog
 structlog.configure(
@@ -123,6 +124,9 @@ async def lifespan(app: FastAPI):
     # Close Playwright browser if initialized
     await close_converter()
 
+    # Close shared Topmate HTTP client
+    await close_topmate_client()
+
     logger.info("Shutdown complete")
 
 
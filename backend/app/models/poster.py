@@ -7,8 +7,8 @@ from typing import Optional, List, Dict, Any, Literal, Union
 
 # Topmate Profile Models
 class TopmateService(BaseModel):
-    id: Union[str, int]
-    title: str
+    id: Union[str, int] = ""
+    title: str = ""
     description: Optional[str] = ""
     type: int = 1
     duration: int = 30
@@ -28,8 +28,8 @@ class TopmateService(BaseModel):
 
 
 class TopmateBadge(BaseModel):
-    id: Union[str, int]
-    name: str
+    id: Union[str, int] = ""
+    name: str = ""
     description: Optional[str] = None
     image_url: Optional[str] = None
 
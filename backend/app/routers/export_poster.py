@@ -11,7 +11,7 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import Response
 from pydantic import BaseModel
 from typing import List, Union, Literal, Optional
-from app.services.html_to_image import convert_html_to_png
+from app.services.html_to_image import convert_html_to_png, convert_html_batch
 import io
 
 
@@ -161,35 +161,28 @@ async def export_poster(request: ExportPosterRequest):
                 from reportlab.pdfgen import canvas as pdf_canvas
                 from reportlab.lib.utils import ImageReader
                 from PIL import Image
-                import base64
+                
+                # Render all slides concurrently (scale=1 for PDF to avoid huge files)
+                print(f"📄 Rendering {len(html_array)} slides...")
+                slide_pngs = await convert_html_batch(
+                    html_array,
+                    dimensions,
+                    scale=1.0
+                )
                 
                 # Create PDF with multiple pages
                 pdf_buffer = io.BytesIO()
                 c = pdf_canvas.Canvas(pdf_buffer, pagesize=(request.width, request.height))
                 
-                for i, html in enumerate(html_array):
-                    print(f"📄 Processing slide {i + 1}/{len(html_array)}...")
+                for i, png_bytes in enumerate(slide_pngs):
+                    # Convert to PIL Image and add to PDF
+                    img = Image.open(io.BytesIO(png_bytes))
+                    img_reader = ImageReader(img)
                     
-                    # Convert HTML to PNG (scale=1 for PDF to avoid huge files)
-                    png_data_url = await convert_html_to_png(
-                        html=html,
-                        dimensions=dimensions,
-                        scale=1.0
-                    )
+                    if i > 0:
+                        c.showPage()  # Add new page for slides after first
                     
-                    # Extract base64 data from data URL
-                    if png_data_url.startswith("data:image/png;base64,"):
-                        png_base64 = png_data_url.split(",")[1]
-                        png_bytes = base64.b64decode(png_base64)
-                        
-                        # Convert to PIL Image and add to PDF
-                        img = Image.open(io.BytesIO(png_bytes))
-                        img_reader = ImageReader(img)
-                        
-                        if i > 0:
-                            c.showPage()  # Add new page for slides after first
-                        
-                        c.drawImage(img_reader, 0, 0, width=request.width, height=request.height)
+                    c.drawImage(img_reader, 0, 0, width=request.width, height=request.height)
                 
                 c.save()
                 pdf_buffer.seek(0)
@@ -218,23 +211,18 @@ async def export_poster(request: ExportPosterRequest):
         
         # Convert HTML to PNG
         print(f"🎨 Converting HTML to PNG ({request.width}x{request.height}, scale={scale})...")
-        png_data_url = await convert_html_to_png(
+        png_bytes = await convert_html_to_png(
             html=html_content,
             dimensions=dimensions,
             scale=scale
         )
         
-        # Extract base64 data from data URL
-        if not png_data_url.startswith("data:image/png;base64,"):
+        if not png_bytes:
             raise HTTPException(
                 status_code=500,
                 detail="Failed to generate PNG image"
             )
         
-        import base64
-        png_base64 = png_data_url.split(",")[1]
-        png_bytes = base64.b64decode(png_base64)
-        
         if request.format == "png":
             # Return PNG directly
             filename = f"poster-{request.width}x{request.height}@{int(scale)}x.png"
@@ -161,6 +161,9 @@ async def stream_poster_generation(job_id: str, request: Request):
     
     connection = await sse_manager.connect(job_id, connection_id)
     
+    # Let the worker know a client is listening
+    await sse_manager.mark_ready(job_id)
+    
     # Send initial status
     await connection.send("status", {
         "job_id": job_id,
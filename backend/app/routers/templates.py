@@ -215,11 +215,14 @@ async def generate_from_template(request: GenerateFromTemplateRequest):
         await sse_manager.send_log(job_id, "INFO", f"Starting poster generation for {section}")
 
         # Queue to TaskIQ (non-blocking)
+        # Pass the resolved row id so the worker renders the same version
+        # recorded on the job and returned below
         await process_template_poster_task.kiq(
             job_id=job_id,
             template_id=request.template_id,
             custom_data=request.custom_data,
-            metadata=request.metadata
+            metadata=request.metadata,
+            template_uuid=str(template['id'])
         )
 
         # Return immediately with SSE endpoint
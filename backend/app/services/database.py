@@ -3,10 +3,11 @@ PostgreSQL Database Service
 Handles database connections and operations for job management
 """
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from contextlib import asynccontextmanager
 from datetime import datetime
 import asyncpg
+import orjson
 import structlog
 import json
 
@@ -14,6 +15,38 @@ from app.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Grouped template_poster_results inserts (written together with executemany)
+TEMPLATE_RESULT_BATCH_SIZE = 50
+TEMPLATE_RESULT_FLUSH_INTERVAL = 0.05  # seconds
+TEMPLATE_RESULT_INSERT_SQL = """
+    INSERT INTO template_poster_results
+    (job_id, template_id, entity_id, custom_data, output_url, s3_key, status,
+     template_version, generation_time_ms, error_message, metadata)
+    VALUES ($1, $2, $3, $4::jsonb, $5, $6, $7, $8, $9, $10, $11::jsonb)
+"""
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    """Encode a jsonb parameter (already-serialized strings pass through)"""
+    payload = value.encode('utf-8') if isinstance(value, str) else orjson.dumps(value)
+    return b'\x01' + payload  # binary jsonb format version
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    """Decode a binary jsonb value"""
+    return orjson.loads(data[1:])
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Register the orjson jsonb codec on each new pooled connection"""
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema='pg_catalog',
+        format='binary'
+    )
+
 
 class DatabaseService:
     """
@@ -23,6 +56,8 @@ class DatabaseService:
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
         self._is_initialized = False
+        self._template_results: List[Tuple[tuple, asyncio.Future]] = []
+        self._template_flush_task: Optional[asyncio.Task] = None
     
     async def initialize(self) -> bool:
         """Initialize the database connection pool"""
@@ -38,6 +73,7 @@ class DatabaseService:
                 min_size=5,
                 max_size=20,
                 command_timeout=60,
+                init=_init_connection,
             )
             
             # Verify connection
@@ -54,6 +90,7 @@ class DatabaseService:
     
     async def close(self):
         """Close the database connection pool"""
+        await self.flush_template_results()
         if self.pool:
             await self.pool.close()
             self._is_initialized = False
@@ -399,6 +436,92 @@ class DatabaseService:
             )
             return [dict(row) for row in rows]
 
+    # ============ Template Poster Results ============
+
+    async def add_template_result(
+        self,
+        job_id: str,
+        entity_id: str,
+        custom_data: Dict[str, Any],
+        status: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        template_id: Optional[Any] = None,
+        output_url: Optional[str] = None,
+        s3_key: Optional[str] = None,
+        template_version: Optional[int] = None,
+        generation_time_ms: Optional[int] = None,
+        error_message: Optional[str] = None
+    ):
+        """
+        Insert a template_poster_results row
+
+        Concurrent calls are grouped and written with one executemany once
+        TEMPLATE_RESULT_BATCH_SIZE rows are pending or after
+        TEMPLATE_RESULT_FLUSH_INTERVAL seconds, whichever comes first.
+        Returns only after this row is committed.
+
+        Raises:
+            Exception if this row can't be inserted
+        """
+        written = asyncio.get_running_loop().create_future()
+        self._template_results.append(((
+            job_id, template_id, entity_id, custom_data,
+            output_url, s3_key, status, template_version,
+            generation_time_ms, error_message, metadata or {}
+        ), written))
+
+        if len(self._template_results) >= TEMPLATE_RESULT_BATCH_SIZE:
+            await self.flush_template_results()
+        elif self._template_flush_task is None or self._template_flush_task.done():
+            self._template_flush_task = asyncio.create_task(self._flush_template_results_later())
+
+        await written
+
+    async def _flush_template_results_later(self):
+        """Flush buffered template results after the flush interval"""
+        await asyncio.sleep(TEMPLATE_RESULT_FLUSH_INTERVAL)
+        await self.flush_template_results()
+
+    async def flush_template_results(self):
+        """
+        Write all pending template_poster_results rows
+
+        If the grouped insert fails, rows are retried one at a time so a
+        single bad row only fails its own add_template_result call.
+        """
+        if not self._template_results:
+            return
+
+        pending, self._template_results = self._template_results, []
+        rows = [row for row, _ in pending]
+        try:
+            async with self.connection() as conn:
+                await conn.executemany(TEMPLATE_RESULT_INSERT_SQL, rows)
+        except Exception as e:
+            logger.warning("Grouped template result insert failed, retrying rows individually",
+                           count=len(rows), error=str(e))
+            await self._write_template_results_individually(pending)
+            return
+
+        logger.debug("Wrote template results", count=len(rows))
+        for _, written in pending:
+            if not written.done():
+                written.set_result(None)
+
+    async def _write_template_results_individually(self, pending: List[Tuple[tuple, asyncio.Future]]):
+        """Insert rows one by one, resolving each caller with its own outcome"""
+        for row, written in pending:
+            try:
+                async with self.connection() as conn:
+                    await conn.execute(TEMPLATE_RESULT_INSERT_SQL, *row)
+            except Exception as e:
+                logger.error("Failed to write template result", job_id=row[0], error=str(e))
+                if not written.done():
+                    written.set_exception(e)
+            else:
+                if not written.done():
+                    written.set_result(None)
+
     @property
     def is_healthy(self) -> bool:
         """Check if database is healthy"""
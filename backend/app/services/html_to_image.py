@@ -4,8 +4,11 @@ Converts HTML to PNG using Playwright (async API)
 """
 import asyncio
 import base64
-from typing import Dict
-from playwright.async_api import async_playwright
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+from playwright.async_api import async_playwright, BrowserContext, Page
+
+from app.config import settings
 
 
 class HTMLToImageConverter:
@@ -14,6 +17,10 @@ class HTMLToImageConverter:
     _instance = None
     _browser = None
     _playwright = None
+    # One browser context per device scale factor, shared by all renders
+    _contexts: Dict[float, BrowserContext] = {}
+    # Caps concurrent pages so gathered renders don't oversubscribe Chromium
+    _render_semaphore = asyncio.Semaphore(settings.render_concurrency)
 
     def __new__(cls):
         if cls._instance is None:
@@ -40,12 +47,67 @@ class HTMLToImageConverter:
     async def close(self):
         """Close Playwright browser"""
         if self._browser:
+            self._contexts = {}
             await self._browser.close()
             await self._playwright.stop()
             self._browser = None
             self._playwright = None
             print("[HTML2PNG] Playwright browser closed")
 
+    async def new_page(self, width: int, height: int, scale: float = 1.0) -> Page:
+        """
+        Open a page in the shared browser context for this scale factor
+
+        Contexts are created once and reused, so each render only pays for
+        a new page. Callers must close the page when done.
+
+        Args:
+            width: Viewport width in pixels
+            height: Viewport height in pixels
+            scale: Device scale factor
+
+        Returns:
+            Playwright Page sized to the viewport
+        """
+        if not self._browser:
+            await self.initialize()
+
+        context = self._contexts.get(scale)
+        if context is None:
+            context = await self._browser.new_context(device_scale_factor=scale)
+            # Another render may have created the context while we awaited
+            existing = self._contexts.setdefault(scale, context)
+            if existing is not context:
+                await context.close()
+                context = existing
+
+        page = await context.new_page()
+        await page.set_viewport_size({'width': width, 'height': height})
+        return page
+
+    @asynccontextmanager
+    async def render_page(self, width: int, height: int, scale: float = 1.0) -> AsyncIterator[Page]:
+        """
+        Open a page for one render, holding the render semaphore until it closes
+
+        Use this for renders outside html_to_png so they count against the
+        same concurrency cap.
+
+        Args:
+            width: Viewport width in pixels
+            height: Viewport height in pixels
+            scale: Device scale factor
+
+        Yields:
+            Playwright Page sized to the viewport (closed on exit)
+        """
+        async with self._render_semaphore:
+            page = await self.new_page(width, height, scale)
+            try:
+                yield page
+            finally:
+                await page.close()
+
     async def html_to_png(
         self,
         html: str,
@@ -67,12 +129,24 @@ class HTMLToImageConverter:
         Returns:
             PNG image as bytes
         """
-        import re
-        
         # Lazy initialization if not already done
         if not self._browser:
             await self.initialize()
 
+        async with self._render_semaphore:
+            return await self._render(html, width, height, scale, timeout)
+
+    async def _render(
+        self,
+        html: str,
+        width: int,
+        height: int,
+        scale: float,
+        timeout: int
+    ) -> bytes:
+        """Render HTML in a new page (caller holds the render semaphore)"""
+        import re
+
         page = None
         try:
             # Check if html already has DOCTYPE or html tag
@@ -106,11 +180,8 @@ class HTMLToImageConverter:
                             actual_height = extracted_h
                             print(f"[HTML2PNG] Using extracted dimensions: {actual_width}x{actual_height}")
 
-            # Create new page with the appropriate viewport
-            page = await self._browser.new_page(
-                viewport={'width': actual_width, 'height': actual_height},
-                device_scale_factor=scale
-            )
+            # Open a page with the appropriate viewport in the shared context
+            page = await self.new_page(actual_width, actual_height, scale)
 
             # Set default timeout for this page
             page.set_default_timeout(timeout)
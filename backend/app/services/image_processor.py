@@ -3,11 +3,24 @@ Image Processing Service
 Handles image overlay using Pillow (Sharp equivalent in Python)
 """
 import io
+import re
 import base64
 import httpx
 from PIL import Image, ImageDraw
 from typing import Optional, Dict
 
+# Any {name} token; names not in the data are left untouched
+_PLACEHOLDER_PATTERN = re.compile(r'\{([^{}]+)\}')
+# <img id="profilePic" style="display: none"> -> visible
+_HIDDEN_PROFILE_PIC_PATTERN = re.compile(
+    r'(<img[^>]*id=["\']?profilePic["\']?[^>]*)(style=["\'][^"\']*display\s*:\s*none[^"\']*["\'])',
+    re.IGNORECASE
+)
+# <div id="placeholder"> shown while no image is available
+_PLACEHOLDER_DIV_PATTERN = re.compile(r'(<div[^>]*id=["\']?placeholder["\']?[^>]*)(>)', re.IGNORECASE)
+_SCRIPT_TAG_PATTERN = re.compile(r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>', re.IGNORECASE)
+_IMAGE_COLUMNS = frozenset(['profile_pic', 'profile_picture', 'avatar', 'image', 'photo'])
+
 
 async def overlay_logo_and_profile(
     base_image_bytes: bytes,
@@ -131,41 +144,23 @@ def replace_placeholders(html: str, data: Dict[str, any], columns: Optional[list
     Returns:
         HTML with placeholders replaced
     """
-    import re
-
-    result = html
-
     # If columns not provided, use all keys from data dict
     if columns is None:
-        columns = list(data.keys())
-
-    # Replace each placeholder
-    for col in columns:
-        placeholder = f"{{{col}}}"
-        value = str(data.get(col, ""))
-
-        # Replace the placeholder
-        result = result.replace(placeholder, value)
-
-        # Special handling for image placeholders (like profile_pic)
-        if col.lower() in ['profile_pic', 'profile_picture', 'avatar', 'image', 'photo']:
-            if value and value.strip():
-                # If placeholder has a value, show the image (remove display: none)
-                result = re.sub(
-                    r'(<img[^>]*id=["\']?profilePic["\']?[^>]*)(style=["\'][^"\']*display\s*:\s*none[^"\']*["\'])',
-                    r'\1style=""',
-                    result,
-                    flags=re.IGNORECASE
-                )
-                # Hide the placeholder div
-                result = re.sub(
-                    r'(<div[^>]*id=["\']?placeholder["\']?[^>]*)(>)',
-                    r'\1 style="display: none;">',
-                    result,
-                    flags=re.IGNORECASE
-                )
+        columns = data.keys()
+
+    values = {col: str(data.get(col, "")) for col in columns}
+
+    # Replace all placeholders in a single pass over the HTML
+    result = _PLACEHOLDER_PATTERN.sub(lambda m: values.get(m.group(1), m.group(0)), html)
+
+    # Special handling for image placeholders (like profile_pic)
+    if any(col.lower() in _IMAGE_COLUMNS and value.strip() for col, value in values.items()):
+        # If placeholder has a value, show the image (remove display: none)
+        result = _HIDDEN_PROFILE_PIC_PATTERN.sub(r'\1style=""', result)
+        # Hide the placeholder div
+        result = _PLACEHOLDER_DIV_PATTERN.sub(r'\1 style="display: none;">', result)
 
     # Remove all <script> tags to prevent JavaScript interference
-    result = re.sub(r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>', '', result, flags=re.IGNORECASE)
+    result = _SCRIPT_TAG_PATTERN.sub('', result)
 
     return result
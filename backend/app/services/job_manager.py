@@ -12,7 +12,7 @@ import structlog
 from app.services.database import database_service
 from app.services.redpanda_client import redpanda_client, TOPIC_POSTER_REQUESTS
 from app.services.sse_manager import sse_manager
-from app.services.topmate_client import fetch_topmate_profile, fetch_profile_by_user_id, parse_user_identifiers
+from app.services.topmate_client import fetch_many_profiles, parse_user_identifiers
 from app.services.html_to_image import convert_html_to_png
 from app.services.image_processor import replace_placeholders, overlay_logo_and_profile
 from app.services.storage_service import upload_image
@@ -243,44 +243,35 @@ class JobManager:
             await sse_manager.send_progress(job_id, 0, total_items, 0, 0, None, "starting")
             await sse_manager.send_log(job_id, "INFO", f"Job processing started - {total_items} posters to generate")
             
-            # Fetch all profiles first
+            # Fetch all profiles first (concurrently)
             profiles = []
-            
-            # Fetch username profiles
-            for username in usernames:
-                try:
-                    await sse_manager.send_log(job_id, "DEBUG", f"Fetching profile: {username}")
-                    profile = await fetch_topmate_profile(username)
-                    profiles.append({"type": "username", "identifier": username, "profile": profile})
-                except Exception as e:
-                    logger.error("Failed to fetch profile", username=username, error=str(e))
-                    await sse_manager.send_log(job_id, "WARNING", f"Failed to fetch {username}: {str(e)}")
-                    failure_count += 1
-                    processed += 1
-                    results.append({
-                        "username": username,
-                        "success": False,
-                        "error": str(e)
-                    })
-                    await sse_manager.send_progress(job_id, processed, total_items, success_count, failure_count, username)
-            
-            # Fetch user_id profiles
-            for user_id in user_ids:
-                try:
-                    await sse_manager.send_log(job_id, "DEBUG", f"Fetching profile for user_id: {user_id}")
-                    profile = await fetch_profile_by_user_id(user_id)
-                    profiles.append({"type": "user_id", "identifier": user_id, "profile": profile})
-                except Exception as e:
-                    logger.error("Failed to fetch profile", user_id=user_id, error=str(e))
-                    await sse_manager.send_log(job_id, "WARNING", f"Failed to fetch user {user_id}: {str(e)}")
-                    failure_count += 1
-                    processed += 1
-                    results.append({
-                        "user_id": user_id,
-                        "success": False,
-                        "error": str(e)
-                    })
-                    await sse_manager.send_progress(job_id, processed, total_items, success_count, failure_count, str(user_id))
+            await sse_manager.send_log(job_id, "DEBUG", f"Fetching {total_items} profiles")
+            fetched = await fetch_many_profiles(usernames, user_ids)
+
+            # Results come back as usernames followed by user_ids
+            identifiers = [("username", username) for username in usernames]
+            identifiers += [("user_id", user_id) for user_id in user_ids]
+
+            for (id_type, identifier), profile in zip(identifiers, fetched):
+                if not isinstance(profile, Exception):
+                    profiles.append({"type": id_type, "identifier": identifier, "profile": profile})
+                    continue
+
+                e = profile
+                failure_count += 1
+                processed += 1
+                if id_type == "username":
+                    logger.error("Failed to fetch profile", username=identifier, error=str(e))
+                    await sse_manager.send_log(job_id, "WARNING", f"Failed to fetch {identifier}: {str(e)}")
+                else:
+                    logger.error("Failed to fetch profile", user_id=identifier, error=str(e))
+                    await sse_manager.send_log(job_id, "WARNING", f"Failed to fetch user {identifier}: {str(e)}")
+                results.append({
+                    id_type: identifier,
+                    "success": False,
+                    "error": str(e)
+                })
+                await sse_manager.send_progress(job_id, processed, total_items, success_count, failure_count, str(identifier))
             
             await sse_manager.send_log(job_id, "INFO", f"Fetched {len(profiles)} profiles, generating posters...")
             print(f"✅ [PROCESS] Fetched {len(profiles)} profiles successfully")
@@ -971,6 +962,7 @@ class JobManager:
         """
         parent_job_id = message.get("parent_job_id")
         template_id = message.get("template_id")
+        template_uuid = message.get("template_uuid")
         custom_data = message.get("custom_data", {})
         metadata = message.get("metadata", {})
 
@@ -986,7 +978,8 @@ class JobManager:
                 job_id=parent_job_id,
                 template_id=template_id,
                 custom_data=custom_data,
-                metadata=metadata
+                metadata=metadata,
+                template_uuid=template_uuid
             )
 
             # Update parent job progress
@@ -5,7 +5,7 @@ Handles message publishing and consuming for batch poster generation
 import asyncio
 import json
 import uuid
-from typing import Optional, Callable, Dict, Any, List
+from typing import Optional, Callable, Dict, Any, List, Tuple
 from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
 from aiokafka.admin import AIOKafkaAdminClient, NewTopic
 from aiokafka.errors import TopicAlreadyExistsError
@@ -53,8 +53,8 @@ class RedPandaClient:
                 key_serializer=lambda k: k.encode('utf-8') if k else None,
                 acks='all',
                 enable_idempotence=True,
-                max_batch_size=16384,
-                linger_ms=10,
+                max_batch_size=settings.redpanda_max_batch_size,
+                linger_ms=20,
             )
             await self.producer.start()
             
@@ -153,6 +153,87 @@ class RedPandaClient:
             logger.error("Failed to publish job", job_id=job_id, error=str(e))
             return False
     
+    async def publish_job_nowait(self, job_id: str, job_data: Dict[str, Any]) -> bool:
+        """
+        Queue a job on the producer without waiting for the broker ack
+
+        Delivery failures are logged from the delivery callback.
+
+        Args:
+            job_id: Unique job identifier
+            job_data: Job configuration and data
+
+        Returns:
+            True if the message was queued
+        """
+        if not self._is_initialized or not self.producer:
+            logger.error("RedPanda client not initialized")
+            return False
+
+        try:
+            delivery = await self.producer.send(
+                topic=TOPIC_POSTER_REQUESTS,
+                key=job_id,
+                value={
+                    "job_id": job_id,
+                    "timestamp": asyncio.get_event_loop().time(),
+                    **job_data
+                }
+            )
+        except Exception as e:
+            logger.error("Failed to publish job", job_id=job_id, error=str(e))
+            return False
+
+        def _on_delivery(future: asyncio.Future):
+            if not future.cancelled() and future.exception() is not None:
+                logger.error("Failed to publish job", job_id=job_id, error=str(future.exception()))
+
+        delivery.add_done_callback(_on_delivery)
+        return True
+
+    async def publish_jobs_batch(self, records: List[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """
+        Publish many jobs to the queue, waiting for delivery once at the end
+
+        Messages are appended to the producer's batches without waiting for
+        each ack, so linger_ms/max_batch_size coalesce them into few requests.
+
+        Args:
+            records: (job_id, job_data) pairs
+
+        Returns:
+            Per-record publish success, in input order
+        """
+        if not self._is_initialized or not self.producer:
+            logger.error("RedPanda client not initialized")
+            return [False] * len(records)
+
+        timestamp = asyncio.get_event_loop().time()
+        deliveries = []
+        for job_id, job_data in records:
+            try:
+                deliveries.append(await self.producer.send(
+                    topic=TOPIC_POSTER_REQUESTS,
+                    key=job_id,
+                    value={"job_id": job_id, "timestamp": timestamp, **job_data}
+                ))
+            except Exception as e:
+                logger.error("Failed to publish job", job_id=job_id, error=str(e))
+                deliveries.append(None)
+
+        pending = [d for d in deliveries if d is not None]
+        outcomes = iter(await asyncio.gather(*pending, return_exceptions=True))
+
+        results = []
+        for (job_id, _), delivery in zip(records, deliveries):
+            outcome = next(outcomes) if delivery is not None else None
+            if isinstance(outcome, Exception):
+                logger.error("Failed to publish job", job_id=job_id, error=str(outcome))
+            results.append(delivery is not None and not isinstance(outcome, Exception))
+
+        logger.info("Published jobs to queue", count=sum(results), failed=len(results) - sum(results))
+        return results
+    
     async def publish_progress(self, job_id: str, progress_data: Dict[str, Any]) -> bool:
         """Publish progress update for a job"""
         if not self._is_initialized or not self.producer:
@@ -4,7 +4,9 @@ Manages real-time event streaming to connected clients with Redis pub/sub
 """
 import asyncio
 import json
-from typing import Dict, Set, Optional, Any, AsyncGenerator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Set, Optional, Any, AsyncGenerator, List, Tuple
 from datetime import datetime
 import structlog
 from sse_starlette.sse import ServerSentEvent
@@ -14,6 +16,15 @@ from app.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Redis list signalled when a client's SSE stream for a job is connected
+SSE_READY_KEY = "sse_ready:{job_id}"
+SSE_READY_TTL_SECONDS = 300
+
+# (job_id, buffered events) while inside SSEManager.batch() in the current task
+_event_batch: ContextVar[Optional[Tuple[str, List[Tuple[str, Dict[str, Any]]]]]] = ContextVar(
+    "sse_event_batch", default=None
+)
+
 
 class SSEConnection:
     """Represents a single SSE connection"""
@@ -124,7 +135,6 @@ class SSEManager:
 
                         logger.debug("SSE Manager: Received Redis message", 
                                    job_id=job_id, event_type=event_type)
-                        print(f"📥 [SSE] Received Redis event: {event_type} for job {job_id}")
 
                         if job_id and event_type:
                             # Broadcast to local connections
@@ -141,14 +151,15 @@ class SSEManager:
         async with self._lock:
             if job_id in self._connections:
                 connections = list(self._connections[job_id])
-                print(f"📤 [SSE] Broadcasting {event_type} to {len(connections)} connections for job {job_id}")
             else:
-                print(f"⚠️ [SSE] No connections for job {job_id}, event {event_type} dropped")
                 logger.debug("SSE Manager: No connections for job, event dropped", 
-                           job_id=job_id, event_type=event_type,
-                           registered_jobs=list(self._connections.keys()))
+                           job_id=job_id, event_type=event_type)
                 return
 
+        logger.debug("SSE Manager: Broadcasting event",
+                   job_id=job_id, event_type=event_type,
+                   connections=len(connections))
+
         for connection in connections:
             try:
                 await connection.send(event_type, data)
@@ -186,6 +197,43 @@ class SSEManager:
 
             return connection
     
+    async def mark_ready(self, job_id: str):
+        """Signal (across processes) that a client is listening for a job's events"""
+        try:
+            if not self._initialized:
+                await self.initialize()
+            if self._redis_client:
+                key = SSE_READY_KEY.format(job_id=job_id)
+                async with self._redis_client.pipeline(transaction=False) as pipe:
+                    pipe.lpush(key, 1)
+                    pipe.expire(key, SSE_READY_TTL_SECONDS)
+                    await pipe.execute()
+        except Exception as e:
+            logger.error("SSE Manager: Failed to mark job ready", job_id=job_id, error=str(e))
+
+    async def wait_ready(self, job_id: str, timeout: int = 2) -> bool:
+        """
+        Wait until a client has connected to a job's SSE stream
+
+        Args:
+            job_id: Job identifier
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a client connected, False on timeout or if Redis is unavailable
+        """
+        try:
+            if not self._initialized:
+                await self.initialize()
+            if not self._redis_client:
+                return False
+            return await self._redis_client.blpop(
+                [SSE_READY_KEY.format(job_id=job_id)], timeout=timeout
+            ) is not None
+        except Exception as e:
+            logger.error("SSE Manager: Failed waiting for SSE client", job_id=job_id, error=str(e))
+            return False
+
     async def disconnect(self, connection_id: str):
         """Remove an SSE connection"""
         async with self._lock:
@@ -208,6 +256,11 @@ class SSEManager:
     
     async def broadcast_to_job(self, job_id: str, event_type: str, data: Dict[str, Any]):
         """Broadcast an event to all connections for a specific job via Redis pub/sub"""
+        batch = _event_batch.get()
+        if batch is not None and batch[0] == job_id:
+            batch[1].append((event_type, data))
+            return
+
         try:
             # Ensure Redis is initialized
             if not self._initialized:
@@ -229,9 +282,58 @@ class SSEManager:
             logger.error("Failed to broadcast SSE event", job_id=job_id, error=str(e))
             # Fallback to local broadcast
             await self._broadcast_local(job_id, event_type, data)
-    
-    async def send_progress(
-        self,
+
+    async def send_batch(self, job_id: str, events: List[Tuple[str, Dict[str, Any]]]):
+        """
+        Broadcast several events for a job in one Redis round trip
+
+        Args:
+            job_id: Job identifier
+            events: (event_type, data) pairs, e.g. from progress_event()/log_event()
+        """
+        if not events:
+            return
+        try:
+            if not self._initialized:
+                await self.initialize()
+
+            if self._redis_client:
+                async with self._redis_client.pipeline(transaction=False) as pipe:
+                    for event_type, data in events:
+                        pipe.publish("sse_events", json.dumps({
+                            "job_id": job_id,
+                            "event_type": event_type,
+                            "data": data
+                        }))
+                    await pipe.execute()
+                logger.debug("Published SSE events to Redis", job_id=job_id, count=len(events))
+            else:
+                for event_type, data in events:
+                    await self._broadcast_local(job_id, event_type, data)
+        except Exception as e:
+            logger.error("Failed to broadcast SSE events", job_id=job_id, error=str(e))
+            for event_type, data in events:
+                await self._broadcast_local(job_id, event_type, data)
+
+    @asynccontextmanager
+    async def batch(self, job_id: str):
+        """
+        Buffer this task's events for a job and publish them in one round trip
+
+        send_* calls for job_id inside the block are queued and flushed
+        with send_batch() on exit. Events for other jobs and other tasks
+        are sent immediately as usual.
+        """
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        token = _event_batch.set((job_id, events))
+        try:
+            yield
+        finally:
+            _event_batch.reset(token)
+            await self.send_batch(job_id, events)
+
+    @staticmethod
+    def progress_event(
         job_id: str,
         processed: int,
         total: int,
@@ -239,9 +341,9 @@ class SSEManager:
         failure_count: int,
         current_user: Optional[str] = None,
         phase: str = "processing"
-    ):
-        """Send progress update event"""
-        await self.broadcast_to_job(job_id, "progress", {
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build a progress update event"""
+        return "progress", {
             "job_id": job_id,
             "processed": processed,
             "total": total,
@@ -250,24 +352,68 @@ class SSEManager:
             "percent_complete": round((processed / total) * 100, 1) if total > 0 else 0,
             "current_user": current_user,
             "phase": phase
-        })
-    
-    async def send_poster_completed(
-        self,
+        }
+
+    @staticmethod
+    def poster_completed_event(
         job_id: str,
         username: str,
         poster_url: str,
         success: bool,
         error: Optional[str] = None
-    ):
-        """Send individual poster completion event"""
-        await self.broadcast_to_job(job_id, "poster_completed", {
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build an individual poster completion event"""
+        return "poster_completed", {
             "job_id": job_id,
             "username": username,
             "poster_url": poster_url,
             "success": success,
             "error": error
-        })
+        }
+
+    @staticmethod
+    def log_event(
+        job_id: str,
+        level: str,
+        message: str,
+        details: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build a log event"""
+        return "log", {
+            "job_id": job_id,
+            "level": level,
+            "message": message,
+            "details": details or {},
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    async def send_progress(
+        self,
+        job_id: str,
+        processed: int,
+        total: int,
+        success_count: int,
+        failure_count: int,
+        current_user: Optional[str] = None,
+        phase: str = "processing"
+    ):
+        """Send progress update event"""
+        await self.broadcast_to_job(job_id, *self.progress_event(
+            job_id, processed, total, success_count, failure_count, current_user, phase
+        ))
+    
+    async def send_poster_completed(
+        self,
+        job_id: str,
+        username: str,
+        poster_url: str,
+        success: bool,
+        error: Optional[str] = None
+    ):
+        """Send individual poster completion event"""
+        await self.broadcast_to_job(job_id, *self.poster_completed_event(
+            job_id, username, poster_url, success, error
+        ))
     
     async def send_job_completed(
         self,
@@ -307,13 +453,7 @@ class SSEManager:
         details: Optional[Dict[str, Any]] = None
     ):
         """Send log event"""
-        await self.broadcast_to_job(job_id, "log", {
-            "job_id": job_id,
-            "level": level,
-            "message": message,
-            "details": details or {},
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        await self.broadcast_to_job(job_id, *self.log_event(job_id, level, message, details))
     
     def get_connection_count(self, job_id: Optional[str] = None) -> int:
         """Get number of active connections"""
@@ -2,12 +2,17 @@
 Storage Service
 Handles S3 uploads and local file storage
 """
+import asyncio
 import boto3
 import io
 import base64
+import structlog
+from functools import lru_cache
 from typing import Optional, Dict
 from app.config import settings
 
+logger = structlog.get_logger(__name__)
+
 
 def is_s3_configured() -> bool:
     """Check if S3 credentials are configured"""
@@ -18,6 +23,17 @@ def is_s3_configured() -> bool:
     )
 
 
+@lru_cache(maxsize=1)
+def get_s3_client():
+    """Get the shared S3 client (boto3 clients are thread-safe)"""
+    return boto3.client(
+        "s3",
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+        region_name=settings.aws_region
+    )
+
+
 async def upload_to_s3(file_content: bytes, filename: str) -> str:
     """
     Upload file to S3
@@ -32,15 +48,9 @@ async def upload_to_s3(file_content: bytes, filename: str) -> str:
     if not is_s3_configured():
         raise Exception("S3 is not configured")
 
-    s3_client = boto3.client(
-        "s3",
-        aws_access_key_id=settings.aws_access_key_id,
-        aws_secret_access_key=settings.aws_secret_access_key,
-        region_name=settings.aws_region
-    )
-
-    # Upload to S3
-    s3_client.put_object(
+    # Upload to S3 (in a worker thread so the event loop keeps running)
+    await asyncio.to_thread(
+        get_s3_client().put_object,
         Bucket=settings.aws_s3_bucket,
         Key=filename,
         Body=file_content,
@@ -86,12 +96,12 @@ async def upload_image(image_bytes: bytes = None, data_url: str = None, filename
 
     # Upload to S3
     if is_s3_configured():
-        print("    [S3] Uploading to S3...")
+        logger.debug("Uploading image to S3", key=filename)
         s3_url = await upload_to_s3(image_bytes, filename)
         return {"url": s3_url, "key": filename}
     else:
         # For local development, convert bytes to data URL
-        print("    [S3] S3 not configured, returning data URL")
+        logger.debug("S3 not configured, returning data URL", key=filename)
         image_base64 = base64.b64encode(image_bytes).decode()
         local_url = f"data:image/png;base64,{image_base64}"
         return {"url": local_url, "key": filename}
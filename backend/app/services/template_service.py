@@ -6,8 +6,35 @@ import re
 import base64
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
+from uuid import UUID
 import asyncio
 
+from app.services.database import database_service
+
+# {placeholder} / {nested.placeholder} syntax used by templates
+PLACEHOLDER_PATTERN = re.compile(r'\{([a-zA-Z_][a-zA-Z0-9_.]*)\}')
+
+# Latest active template for a section (dimensions included)
+ACTIVE_TEMPLATE_SQL = """
+    SELECT id, name, html_content, css_content, version, width, height
+    FROM templates
+    WHERE section = $1 AND is_active = true
+    ORDER BY version DESC
+    LIMIT 1
+"""
+
+# Template row by id (dimensions included)
+TEMPLATE_BY_ID_SQL = """
+    SELECT id, name, html_content, css_content, version, width, height
+    FROM templates
+    WHERE id = $1
+"""
+
+# Template rows by id: template_uuid -> record. Rows are never edited in
+# place (uploads create a new version), so entries never go stale.
+_template_cache: Dict[str, Any] = {}
+
 
 def extract_dimensions(html: str) -> Dict[str, int]:
     """
@@ -87,9 +114,7 @@ def extract_placeholders(html: str) -> List[str]:
         >>> extract_placeholders("<h1>{consumer_name}</h1><p>{consumer_message}</p>")
         ['consumer_name', 'consumer_message']
     """
-    pattern = r'\{([a-zA-Z_][a-zA-Z0-9_.]*)\}'
-    matches = re.findall(pattern, html)
-    return list(set([m.strip() for m in matches]))
+    return list(set(PLACEHOLDER_PATTERN.findall(html)))
 
 
 def replace_placeholders(html: str, data: Dict[str, Any]) -> str:
@@ -122,9 +147,6 @@ def replace_placeholders(html: str, data: Dict[str, Any]) -> str:
                 return f'{{{path}}}'  # Return original placeholder if not found
         return str(value)
     
-    # Find all placeholders in HTML
-    pattern = r'\{([a-zA-Z_][a-zA-Z0-9_.]*)\}'
-    
     def replace_match(match):
         placeholder_key = match.group(1).strip()
         # Check if it's a nested key (contains dot)
@@ -136,31 +158,22 @@ def replace_placeholders(html: str, data: Dict[str, Any]) -> str:
         else:
             return match.group(0)  # Return original if not found
     
-    result = re.sub(pattern, replace_match, html)
+    result = PLACEHOLDER_PATTERN.sub(replace_match, html)
     return result
 
 
-async def render_html_to_image(html: str, css: Optional[str] = None, width: int = 1200, height: int = 630) -> bytes:
+@lru_cache(maxsize=64)
+def _html_shell(width: int, height: int, css: str) -> Tuple[str, str]:
     """
-    Render HTML to PNG using Playwright
+    Build the static document shell around rendered HTML
 
-    Args:
-        html: HTML content to render
-        css: Optional CSS styles
-        width: Image width in pixels
-        height: Image height in pixels
+    The shell only depends on the viewport and CSS, so it is built once per
+    combination and reused across renders.
 
     Returns:
-        PNG image as bytes
+        Tuple of (prefix, suffix) to place around the body HTML
     """
-    from playwright.async_api import async_playwright
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page(viewport={'width': width, 'height': height})
-
-        # Build complete HTML document
-        full_html = f"""
+    prefix = f"""
         <!DOCTYPE html>
         <html>
         <head>
@@ -177,12 +190,37 @@ async def render_html_to_image(html: str, css: Optional[str] = None, width: int
                     height: {height}px;
                     overflow: hidden;
                 }}
-                {css or ''}
+                {css}
             </style>
         </head>
-        <body>{html}</body>
+        <body>"""
+    suffix = """</body>
         </html>
         """
+    return prefix, suffix
+
+
+async def render_html_to_image(html: str, css: Optional[str] = None, width: int = 1200, height: int = 630) -> bytes:
+    """
+    Render HTML to PNG using Playwright
+
+    Args:
+        html: HTML content to render
+        css: Optional CSS styles
+        width: Image width in pixels
+        height: Image height in pixels
+
+    Returns:
+        PNG image as bytes
+    """
+    from app.services.html_to_image import _converter
+
+    # Reuse the shared Playwright browser (bounded by its render semaphore)
+    # instead of launching one per preview
+    async with _converter.render_page(width, height) as page:
+        # Wrap HTML in the cached document shell for this viewport/CSS
+        prefix, suffix = _html_shell(width, height, css or '')
+        full_html = prefix + html + suffix
 
         await page.set_content(full_html, wait_until='networkidle')
 
@@ -190,10 +228,7 @@ async def render_html_to_image(html: str, css: Optional[str] = None, width: int
         await page.wait_for_timeout(500)
 
         # Take screenshot
-        screenshot = await page.screenshot(type='png', full_page=False)
-        await browser.close()
-
-        return screenshot
+        return await page.screenshot(type='png', full_page=False)
 
 
 async def render_html_to_base64(html: str, css: Optional[str] = None, width: int = 1200, height: int = 630) -> str:
@@ -249,6 +284,45 @@ def parse_template_id(template_id: str) -> str:
     return template_id.replace('_latest', '').strip()
 
 
+async def get_active_template(section: str):
+    """
+    Get the active template for a section (not cached)
+
+    Args:
+        section: Template section (e.g., 'testimonial')
+
+    Returns:
+        Template record or None if the section has no active template
+    """
+    async with database_service.connection() as conn:
+        return await conn.fetchrow(ACTIVE_TEMPLATE_SQL, section)
+
+
+async def get_cached_template(template_uuid: str):
+    """
+    Get a template row by id, cached for the life of the process
+
+    The router resolves the active template once per request and passes
+    its id along, so workers never serve a template the API didn't pick.
+
+    Args:
+        template_uuid: Template row id
+
+    Returns:
+        Template record or None if no template has this id
+    """
+    template = _template_cache.get(template_uuid)
+    if template is not None:
+        return template
+
+    async with database_service.connection() as conn:
+        template = await conn.fetchrow(TEMPLATE_BY_ID_SQL, UUID(template_uuid))
+
+    if template:
+        _template_cache[template_uuid] = template
+    return template
+
+
 def generate_s3_key(section: str, entity_id: str, timestamp: Optional[int] = None) -> str:
     """
     Generate S3 key for uploaded image
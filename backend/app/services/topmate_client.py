@@ -2,13 +2,187 @@
 Topmate API Client
 Handles fetching user profiles from Topmate API
 """
+import asyncio
+import functools
+import re
+import time
 import httpx
-from typing import Optional
+import orjson
+from collections import OrderedDict
+from typing import Any, Optional, Union, Dict, List, Tuple
+from pydantic import TypeAdapter
 from app.models.poster import TopmateProfile, TopmateService, TopmateBadge
 
 TOPMATE_API_BASE = "https://gcp.galactus.run/fetchByUsername"
 
+# One comma/newline separated identifier, without surrounding whitespace
+_IDENTIFIER_PATTERN = re.compile(r'[^,\n\s](?:[^,\n]*[^,\n\s])?')
 
+# In-process profile cache (LRU with TTL)
+PROFILE_CACHE_TTL_SECONDS = 300
+PROFILE_CACHE_MAX_SIZE = 1024
+_profile_cache: "OrderedDict[str, Tuple[float, TopmateProfile]]" = OrderedDict()
+_profile_locks: Dict[str, asyncio.Lock] = {}
+
+# Compiled validators for the services/badges lists in profile payloads
+_SERVICES_ADAPTER = TypeAdapter(List[TopmateService])
+_BADGES_ADAPTER = TypeAdapter(List[TopmateBadge])
+
+# Shared HTTP client (keeps connections to the Topmate API alive across fetches)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared Topmate HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared Topmate HTTP client at app shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _get_cached_profile(key: str) -> Optional[TopmateProfile]:
+    """Return a cached profile if present and not expired"""
+    entry = _profile_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, profile = entry
+    if expires_at < time.monotonic():
+        _profile_cache.pop(key, None)
+        return None
+    _profile_cache.move_to_end(key)
+    return profile
+
+
+def _set_cached_profile(key: str, profile: TopmateProfile):
+    """Store a profile, evicting the least recently used entries when full"""
+    _profile_cache[key] = (time.monotonic() + PROFILE_CACHE_TTL_SECONDS, profile)
+    _profile_cache.move_to_end(key)
+    while len(_profile_cache) > PROFILE_CACHE_MAX_SIZE:
+        _profile_cache.popitem(last=False)
+
+
+def _cached_profile(key_prefix: str):
+    """
+    Cache profile fetches by identifier
+
+    Concurrent lookups for the same identifier share a lock so only one
+    request goes to the Topmate API. Failures are not cached.
+    """
+    def decorator(fetch):
+        @functools.wraps(fetch)
+        async def wrapper(identifier):
+            key = f"{key_prefix}:{identifier}"
+            profile = _get_cached_profile(key)
+            if profile is not None:
+                return profile
+
+            lock = _profile_locks.setdefault(key, asyncio.Lock())
+            try:
+                async with lock:
+                    profile = _get_cached_profile(key)
+                    if profile is None:
+                        profile = await fetch(identifier)
+                        _set_cached_profile(key, profile)
+                    return profile
+            finally:
+                if not lock.locked():
+                    _profile_locks.pop(key, None)
+
+        return wrapper
+    return decorator
+
+
+def clear_profile_cache():
+    """Drop all cached profiles"""
+    _profile_cache.clear()
+
+
+# Profile fields that fall back through alternative API keys when empty
+_PROFILE_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "user_id": ("user_id", "id"),
+    "display_name": ("display_name", "name"),
+    "profile_pic": ("profile_pic", "picture", "profile_image"),
+    "bio": ("bio", "description"),
+    "total_bookings": ("total_bookings", "bookings_count"),
+    "total_reviews": ("total_reviews", "reviews_count"),
+    "total_ratings": ("total_ratings", "ratings_count"),
+    "average_rating": ("average_rating", "rating", "avg_rating"),
+    "expertise_category": ("expertise_category", "expertise"),
+    "join_date": ("join_date", "created_at"),
+}
+
+# Default value for every profile field read from the API payload
+_PROFILE_DEFAULTS: Dict[str, Any] = {
+    "user_id": "",
+    "username": "",
+    "first_name": "",
+    "last_name": "",
+    "display_name": None,
+    "profile_pic": "",
+    "bio": "",
+    "description": None,
+    "linkedin_url": None,
+    "instagram_url": None,
+    "twitter_url": None,
+    "timezone": "UTC",
+    "total_bookings": 0,
+    "total_reviews": 0,
+    "total_ratings": 0,
+    "average_rating": 0.0,
+    "expertise_count": 0,
+    "expertise_category": None,
+    "liked_properties": None,
+    "testimonials_count": 0,
+    "ai_testimonial_summary": None,
+    "meta_image": None,
+    "join_date": None,
+}
+
+
+def _coalesce(data: Dict[str, Any], keys: Tuple[str, ...], default: Any = None) -> Any:
+    """Return the first non-empty value among keys"""
+    for key in keys:
+        value = data.get(key)
+        if value:
+            return value
+    return default
+
+
+def _profile_fields(data: Dict[str, Any], **defaults) -> Dict[str, Any]:
+    """
+    Map a Topmate API payload onto TopmateProfile scalar fields
+
+    Args:
+        data: Decoded API response
+        **defaults: Per-endpoint overrides of _PROFILE_DEFAULTS
+
+    Returns:
+        Dict of TopmateProfile keyword arguments (without services/badges)
+    """
+    fields = {}
+    for field, default in _PROFILE_DEFAULTS.items():
+        default = defaults.get(field, default)
+        keys = _PROFILE_ALIASES.get(field)
+        fields[field] = _coalesce(data, keys, default) if keys else data.get(field, default)
+
+    if not fields["display_name"]:
+        fields["display_name"] = f"{fields['first_name']} {fields['last_name']}".strip()
+
+    return fields
+
+
+@_cached_profile("username")
 async def fetch_topmate_profile(username: str) -> TopmateProfile:
     """
     Fetch Topmate profile by username
@@ -24,76 +198,26 @@ async def fetch_topmate_profile(username: str) -> TopmateProfile:
     """
     url = f"{TOPMATE_API_BASE}/?username={username}"
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url)
-
-        if not response.is_success:
-            raise Exception(f"Failed to fetch Topmate profile: {response.status_code}")
-
-        data = response.json()
-
-        # Transform API response to TopmateProfile
-        profile = TopmateProfile(
-            user_id=data.get("user_id") or data.get("id") or "",
-            username=data.get("username", ""),
-            first_name=data.get("first_name", ""),
-            last_name=data.get("last_name", ""),
-            display_name=data.get("display_name") or data.get("name") or f"{data.get('first_name', '')} {data.get('last_name', '')}".strip(),
-            profile_pic=data.get("profile_pic") or data.get("picture") or "",
-            bio=data.get("bio") or data.get("description") or "",
-            description=data.get("description"),
-            linkedin_url=data.get("linkedin_url"),
-            instagram_url=data.get("instagram_url"),
-            twitter_url=data.get("twitter_url"),
-            timezone=data.get("timezone", "UTC"),
-
-            # Metrics
-            total_bookings=data.get("total_bookings") or data.get("bookings_count") or 0,
-            total_reviews=data.get("total_reviews") or data.get("reviews_count") or 0,
-            total_ratings=data.get("total_ratings") or data.get("ratings_count") or 0,
-            average_rating=data.get("average_rating") or data.get("rating") or 0.0,
-            expertise_count=data.get("expertise_count", 0),
-            expertise_category=data.get("expertise_category") or data.get("expertise"),
-
-            # Services
-            services=[
-                TopmateService(
-                    id=s.get("id", ""),
-                    title=s.get("title", ""),
-                    description=s.get("description", ""),
-                    type=s.get("type", 1),
-                    duration=s.get("duration", 30),
-                    charge=s.get("charge", {"amount": 0, "currency": "INR"}),
-                    booking_count=s.get("booking_count", 0),
-                    promised_response_time=s.get("promised_response_time")
-                )
-                for s in data.get("services", [])
-            ],
-
-            # Badges
-            badges=[
-                TopmateBadge(
-                    id=b.get("id", ""),
-                    name=b.get("name", ""),
-                    description=b.get("description"),
-                    image_url=b.get("image_url")
-                )
-                for b in data.get("badges", [])
-            ],
-
-            # Social proof
-            liked_properties=data.get("liked_properties"),
-            testimonials_count=data.get("testimonials_count", 0),
-            ai_testimonial_summary=data.get("ai_testimonial_summary"),
-
-            # Meta
-            meta_image=data.get("meta_image"),
-            join_date=data.get("join_date") or data.get("created_at")
-        )
+    response = await get_client().get(url)
+
+    if not response.is_success:
+        raise Exception(f"Failed to fetch Topmate profile: {response.status_code}")
+
+    data = orjson.loads(response.content)
 
-        return profile
+    # Transform API response to TopmateProfile
+    profile = TopmateProfile(
+        **_profile_fields(data),
 
+        # Services and badges
+        services=_SERVICES_ADAPTER.validate_python(data.get("services", [])),
+        badges=_BADGES_ADAPTER.validate_python(data.get("badges", []))
+    )
 
+    return profile
+
+
+@_cached_profile("user_id")
 async def fetch_profile_by_user_id(user_id: int) -> TopmateProfile:
     """
     Fetch Topmate profile by numeric user_id
@@ -109,52 +233,58 @@ async def fetch_profile_by_user_id(user_id: int) -> TopmateProfile:
     """
     api_url = f"https://gcp.galactus.run/api/users/{user_id}"
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.get(api_url)
-
-            if response.is_success:
-                data = response.json()
-
-                # Transform to TopmateProfile (same as fetch_topmate_profile)
-                profile = TopmateProfile(
-                    user_id=str(data.get("user_id") or data.get("id") or user_id),
-                    username=data.get("username", f"user_{user_id}"),
-                    first_name=data.get("first_name", ""),
-                    last_name=data.get("last_name", ""),
-                    display_name=data.get("display_name") or data.get("name") or f"{data.get('first_name', '')} {data.get('last_name', '')}".strip(),
-                    profile_pic=data.get("profile_pic") or data.get("profile_image") or "",
-                    bio=data.get("bio") or data.get("description") or "",
-                    description=data.get("description") or data.get("bio"),
-                    timezone=data.get("timezone", "UTC"),
-
-                    # Metrics
-                    total_bookings=data.get("total_bookings") or data.get("bookings_count") or 0,
-                    total_reviews=data.get("total_reviews") or data.get("reviews_count") or 0,
-                    total_ratings=data.get("total_ratings") or data.get("ratings_count") or 0,
-                    average_rating=data.get("average_rating") or data.get("avg_rating") or 0.0,
-                    expertise_count=data.get("expertise_count", 0),
-                    expertise_category=data.get("expertise_category"),
-
-                    # Services and badges
-                    services=data.get("services", []),
-                    badges=data.get("badges", []),
-                    liked_properties=data.get("liked_properties"),
-                    testimonials_count=data.get("testimonials_count", 0),
-                    ai_testimonial_summary=data.get("ai_testimonial_summary"),
-
-                    # Meta
-                    meta_image=data.get("meta_image"),
-                    join_date=data.get("join_date") or data.get("created_at")
-                )
+    try:
+        response = await get_client().get(api_url)
 
-                return profile
-        except Exception as e:
-            raise Exception(f"Failed to fetch profile for user ID {user_id}: {str(e)}")
+        if response.is_success:
+            data = orjson.loads(response.content)
+
+            # Transform to TopmateProfile (same as fetch_topmate_profile)
+            fields = _profile_fields(data, user_id=user_id, username=f"user_{user_id}")
+            fields["description"] = _coalesce(data, ("description", "bio"))
+            profile = TopmateProfile(
+                **fields,
+
+                # Services and badges
+                services=_SERVICES_ADAPTER.validate_python(data.get("services", [])),
+                badges=_BADGES_ADAPTER.validate_python(data.get("badges", []))
+            )
+
+            return profile
+    except Exception as e:
+        raise Exception(f"Failed to fetch profile for user ID {user_id}: {str(e)}")
 
     raise Exception(f"User with ID {user_id} not found")
 
 
+async def fetch_many_profiles(
+    usernames: list[str],
+    user_ids: list[int],
+    concurrency: int = 20
+) -> list[Union[TopmateProfile, Exception]]:
+    """
+    Fetch many Topmate profiles concurrently
+
+    Args:
+        usernames: Topmate usernames
+        user_ids: Numeric user IDs
+        concurrency: Maximum number of in-flight requests
+
+    Returns:
+        Profiles (or the raised exception) in order: usernames first, then user_ids
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded(coro):
+        async with semaphore:
+            return await coro
+
+    tasks = [_bounded(fetch_topmate_profile(username)) for username in usernames]
+    tasks += [_bounded(fetch_profile_by_user_id(user_id)) for user_id in user_ids]
+
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
 def parse_user_identifiers(input_str: str) -> tuple[list[str], list[int]]:
     """
     Parse comma or newline separated user identifiers
@@ -165,12 +295,10 @@ def parse_user_identifiers(input_str: str) -> tuple[list[str], list[int]]:
     Returns:
         Tuple of (usernames list, user_ids list)
     """
-    items = [item.strip() for item in input_str.replace("\n", ",").split(",") if item.strip()]
-
     usernames = []
     user_ids = []
 
-    for item in items:
+    for item in _IDENTIFIER_PATTERN.findall(input_str):
         if item.isdigit():
             user_ids.append(int(item))
         else:
@@ -2,15 +2,40 @@
 Webhook Service
 Handles Django API integration for storing posters
 """
+import asyncio
+import time
 import httpx
-from typing import Dict, Any
+import structlog
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from app.config import settings
 
+logger = structlog.get_logger(__name__)
+
+
+@lru_cache(maxsize=128)
+def _poster_labels(poster_name: str) -> Tuple[str, str, str]:
+    """
+    Derive the webhook labels for a campaign name
+
+    Bulk saves reuse the same poster_name for every user, so these are
+    computed once per campaign.
+
+    Returns:
+        Tuple of (template_tag, template_id, title)
+    """
+    return (
+        f"-ms-{poster_name}",
+        f"email-forge-{poster_name}",
+        poster_name.replace("-", " ").upper()
+    )
+
 
 async def store_poster_to_django(
     poster_url: str,
     poster_name: str,
-    user_id: int
+    user_id: int,
+    client: Optional[httpx.AsyncClient] = None
 ) -> Dict[str, Any]:
     """
     Store poster to Django backend via webhooks
@@ -23,72 +48,78 @@ async def store_poster_to_django(
         poster_url: S3 URL of the poster
         poster_name: Campaign name
         user_id: Topmate user ID
+        client: Optional shared HTTP client (a new one is created if omitted)
 
     Returns:
         Result dict with success status
     """
+    if client is None:
+        async with httpx.AsyncClient(timeout=30.0) as own_client:
+            return await store_poster_to_django(poster_url, poster_name, user_id, own_client)
+
     try:
         django_url = settings.django_api_url
-        external_id = f"{poster_name}-{user_id}-{int(__import__('time').time() * 1000)}"
+        ts_ms = time.time_ns() // 1_000_000
+        external_id = f"{poster_name}-{user_id}-{ts_ms}"
 
-        print(f"  👤 User {user_id}:")
+        template_tag, template_id, title = _poster_labels(poster_name)
 
-        # Step 1: Create Video entry
-        print(f"    📹 Creating Video entry...")
+        # Build both payloads up front; the webhook must still be sent after
+        # the Video exists because Django resolves it by external_id
         video_payload = {
             "external_id": external_id,
             "url": poster_url,
             "status": "COMPLETED",
             "user": user_id
         }
+        webhook_payload = {
+            "id": external_id,
+            "status": "succeeded",
+            "output_format": "jpg",
+            "template_tags": [template_tag],  # Triggers monthly_stat_handler
+            "template_id": template_id,
+            "modifications": {
+                "campaign": poster_name,
+                "title": title,
+                "description": f"Poster: {poster_name}",
+                "tag": "custom"
+            },
+            "metadata": f"email-forge-{user_id}-{ts_ms}"
+        }
+
+        # Step 1: Create Video entry
+        logger.debug("Creating Video entry", user_id=user_id, external_id=external_id)
+        video_response = await client.post(
+            f"{django_url}/create-video/",
+            json=video_payload
+        )
+
+        if not video_response.is_success:
+            raise Exception(f"Video API failed: {video_response.status_code} - {video_response.text}")
+
+        logger.debug("Video created", user_id=user_id)
+
+        # Step 2: Trigger webhook
+        logger.debug("Triggering webhook", user_id=user_id)
+        webhook_response = await client.post(
+            f"{django_url}/creatomate-webhook/",
+            json=webhook_payload
+        )
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            video_response = await client.post(
-                f"{django_url}/create-video/",
-                json=video_payload
-            )
-
-            if not video_response.is_success:
-                raise Exception(f"Video API failed: {video_response.status_code} - {video_response.text}")
-
-            print(f"    ✅ Video created")
-
-            # Step 2: Trigger webhook
-            print(f"    🔗 Triggering webhook...")
-            webhook_payload = {
-                "id": external_id,
-                "status": "succeeded",
-                "output_format": "jpg",
-                "template_tags": [f"-ms-{poster_name}"],  # Triggers monthly_stat_handler
-                "template_id": f"email-forge-{poster_name}",
-                "modifications": {
-                    "campaign": poster_name,
-                    "title": poster_name.replace("-", " ").upper(),
-                    "description": f"Poster: {poster_name}",
-                    "tag": "custom"
-                },
-                "metadata": f"email-forge-{user_id}-{int(__import__('time').time() * 1000)}"
-            }
-
-            webhook_response = await client.post(
-                f"{django_url}/creatomate-webhook/",
-                json=webhook_payload
-            )
-
-            if not webhook_response.is_success:
-                raise Exception(f"Webhook failed: {webhook_response.status_code} - {webhook_response.text}")
-
-            print(f"    ✅ UserShareContent created")
-
-            return {
-                "success": True,
-                "posterUrl": poster_url,
-                "posterName": poster_name,
-                "userId": user_id
-            }
+        if not webhook_response.is_success:
+            raise Exception(f"Webhook failed: {webhook_response.status_code} - {webhook_response.text}")
+
+        logger.debug("UserShareContent created", user_id=user_id)
+
+        return {
+            "success": True,
+            "posterUrl": poster_url,
+            "posterName": poster_name,
+            "userId": user_id
+        }
 
     except Exception as e:
-        print(f"    ❌ Error: {e}")
+        logger.error("Failed to store poster to Django", user_id=user_id, error=str(e))
         return {
             "success": False,
             "userId": user_id,
@@ -96,32 +127,42 @@ async def store_poster_to_django(
         }
 
 
-async def store_bulk_posters(posters: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+async def store_bulk_posters(
+    posters: list[Dict[str, Any]],
+    concurrency: int = 10
+) -> list[Dict[str, Any]]:
     """
     Store multiple posters to Django
 
     Args:
         posters: List of {userId, posterUrl, posterName}
+        concurrency: Maximum number of posters stored at once
 
     Returns:
         List of results
     """
-    print(f"📦 Storing {len(posters)} posters to Django...")
+    logger.info("Storing posters to Django", total=len(posters))
 
-    results = []
+    # Bound in-flight requests instead of sleeping between posters
+    semaphore = asyncio.Semaphore(concurrency)
 
-    for poster in posters:
-        result = await store_poster_to_django(
-            poster["posterUrl"],
-            poster["posterName"],
-            poster["userId"]
-        )
-        results.append(result)
+    async with httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    ) as client:
+
+        async def _store(poster: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await store_poster_to_django(
+                    poster["posterUrl"],
+                    poster["posterName"],
+                    poster["userId"],
+                    client=client
+                )
 
-        # Small delay to avoid overwhelming Django
-        await __import__('asyncio').sleep(0.1)
+        results = await asyncio.gather(*[_store(poster) for poster in posters])
 
     success_count = sum(1 for r in results if r["success"])
-    print(f"✅ Successfully stored {success_count}/{len(posters)} posters")
+    logger.info("Stored posters to Django", success_count=success_count, total=len(posters))
 
     return results
@@ -3,7 +3,12 @@ TaskIQ Tasks for Poster Generation
 Async tasks that are queued and processed by workers
 """
 import asyncio
-from typing import Dict, Any, List
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import orjson
 import structlog
 from taskiq import Context
 
@@ -11,10 +16,77 @@ from app.services.taskiq_broker import broker
 from app.services.database import database_service
 from app.services.redpanda_client import redpanda_client
 from app.services.sse_manager import sse_manager
-from app.services.job_manager import job_manager
+from app.services.job_manager import job_manager, POSTER_SIZE_DIMENSIONS
+from app.services.template_service import (
+    parse_template_id,
+    generate_s3_key,
+    get_active_template,
+    get_cached_template,
+    validate_placeholders
+)
+from app.services.storage_service import upload_to_s3
+from app.services.image_processor import replace_placeholders as replace_placeholders_bulk
+from app.services.html_to_image import convert_html_to_png
+from app.services.topmate_client import fetch_topmate_profile
+from app.services.openrouter_client import call_openrouter
+from app.services.prompts import (
+    POSTER_STRATEGIES,
+    POSTER_SYSTEM_PROMPT,
+    CREATIVE_DIRECTOR_SYSTEM_PROMPT,
+    build_creative_directive,
+    FALLBACK_CREATIVE_DIRECTIVE
+)
 
 logger = structlog.get_logger(__name__)
 
+# Markdown code fences (```html / ```) around LLM-generated HTML
+_HTML_FENCE_PATTERN = re.compile(r'```(?:html)?\n?')
+
+# Failed template poster -> template_poster_results + template_generation_logs
+_FAILED_RESULT_SQL = """
+    WITH failed_result AS (
+        INSERT INTO template_poster_results
+        (job_id, entity_id, custom_data, status, error_message, metadata)
+        VALUES ($1, $2, $3::jsonb, 'failed', $4::text, $5::jsonb)
+    )
+    INSERT INTO template_generation_logs (job_id, level, message, details)
+    VALUES (
+        $1, 'ERROR', $6,
+        jsonb_build_object('custom_data', $3::jsonb, 'error', $4::text)
+    )
+"""
+
+# Failure rows that could not be written, retried in the background
+FAILED_RESULT_QUEUE_SIZE = 1000
+FAILED_RESULT_BATCH_SIZE = 100
+FAILED_RESULT_MAX_ATTEMPTS = 5
+FAILED_RESULT_RETRY_DELAY = 1.0  # seconds, doubled after each failed attempt
+_failed_results: asyncio.Queue = asyncio.Queue(maxsize=FAILED_RESULT_QUEUE_SIZE)
+_failed_results_task: Optional[asyncio.Task] = None
+
+
+def _flatten_dict(d: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten nested dicts, joining keys with '_'
+    (e.g. {"overlay": {"fill_color": x}} -> {"overlay_fill_color": x})
+
+    Iterative with an explicit stack of (prefix, items) so nesting depth
+    costs no recursion; keys keep their original order.
+    """
+    out = {}
+    stack = [('', iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            new_key = f"{prefix}_{k}" if prefix else k
+            if isinstance(v, dict):
+                stack.append((new_key, iter(v.items())))
+                break
+            out[new_key] = v
+        else:
+            stack.pop()
+    return out
+
 
 @broker.task(task_name="process_batch_job")
 async def process_batch_job_task(
@@ -36,9 +108,6 @@ async def process_batch_job_task(
     """
     try:
         logger.info("TaskIQ: Starting job processing", job_id=job_id, job_type=job_type)
-        print(f"")
-        print(f"🔵 [TASKIQ] Task started for job: {job_id} (type: {job_type})")
-        print(f"")
 
         # Ensure services are initialized
         await ensure_services_initialized()
@@ -54,14 +123,12 @@ async def process_batch_job_task(
             result = await job_manager._process_html_job_with_redpanda(job_data)
 
         logger.info("TaskIQ: Job processing completed", job_id=job_id, result=result)
-        print(f"✅ [TASKIQ] Task completed for job: {job_id}")
 
         return result
 
     except Exception as e:
         error_msg = str(e)
         logger.error("TaskIQ: Job processing failed", job_id=job_id, error=error_msg)
-        print(f"❌ [TASKIQ] Task failed for job: {job_id} - {error_msg}")
 
         # Update job status to failed
         await database_service.update_job_status(
@@ -97,8 +164,8 @@ async def process_single_poster_task(
         Poster generation result
     """
     try:
-        # Publish to RedPanda for parallel processing
-        await redpanda_client.publish_job(
+        # Queue on RedPanda for parallel processing (the producer batches and acks in the background)
+        await redpanda_client.publish_job_nowait(
             job_id=f"{job_id}_poster_{poster_data.get('username')}",
             job_data={
                 "parent_job_id": job_id,
@@ -119,7 +186,8 @@ async def process_template_poster_task(
     job_id: str,
     template_id: str,
     custom_data: Dict[str, Any],
-    metadata: Dict[str, Any]
+    metadata: Dict[str, Any],
+    template_uuid: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     TaskIQ task to process a single template-based poster
@@ -130,6 +198,8 @@ async def process_template_poster_task(
         template_id: Template identifier (e.g., 'testimonial_latest')
         custom_data: Placeholder values for the template
         metadata: Additional metadata (user_id, entity_id, etc.)
+        template_uuid: Template row resolved by the caller; the section's
+            active template is looked up when omitted
 
     Returns:
         Generation result with S3 URL
@@ -140,141 +210,114 @@ async def process_template_poster_task(
         # Ensure services are initialized
         await ensure_services_initialized()
 
-        # Import here to avoid circular dependencies
-        from app.services.template_service import (
-            parse_template_id,
-            replace_placeholders,
-            render_html_to_image,
-            generate_s3_key,
-            validate_placeholders
-        )
-        from app.services.storage_service import upload_to_s3
-        from app.services.database import database_service
-        import time
-
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
+        
+        # 1. Parse template_id to get section
+        section = parse_template_id(template_id)
         
-        # Send immediate progress - 10% (starting)
-        await sse_manager.send_progress(job_id, 0, 1, 0, 0, None, "processing")
-        await sse_manager.send_log(job_id, "INFO", "Starting template poster generation")
+        async with sse_manager.batch(job_id):
+            # Send immediate progress - 10% (starting)
+            await sse_manager.send_progress(job_id, 0, 1, 0, 0, None, "processing")
+            await sse_manager.send_log(job_id, "INFO", "Starting template poster generation")
 
-        async with database_service.connection() as conn:
-            # 1. Parse template_id to get section
-            section = parse_template_id(template_id)
-            
             # Send progress - 20% (fetching template)
             await sse_manager.send_progress(job_id, 0, 1, 0, 0, None, "fetching_template")
             await sse_manager.send_log(job_id, "DEBUG", f"Fetching template for section: {section}")
 
-            # 2. Fetch active template (including dimensions)
-            template = await conn.fetchrow(
-                """
-                SELECT id, name, html_content, css_content, version, width, height
-                FROM templates
-                WHERE section = $1 AND is_active = true
-                ORDER BY version DESC
-                LIMIT 1
-                """,
-                section
-            )
+        # 2. Fetch the template (including dimensions)
+        if template_uuid:
+            template = await get_cached_template(template_uuid)
+        else:
+            template = await get_active_template(section)
 
-            if not template:
-                raise Exception(f"No active template found for section '{section}'")
-
-            # 3. Validate placeholders
-            validation = validate_placeholders(template['html_content'], custom_data)
-            if validation['missing']:
-                logger.warning("Missing placeholders", missing=validation['missing'])
-            
-            # Send progress - 30% (processing template)
+        if not template:
+            raise Exception(f"No active template found for section '{section}'")
+
+        # 3. Validate placeholders
+        validation = validate_placeholders(template['html_content'], custom_data)
+        if validation['missing']:
+            logger.warning("Missing placeholders", missing=validation['missing'])
+        
+        # Send progress - 30% (processing template)
+        async with sse_manager.batch(job_id):
             await sse_manager.send_progress(job_id, 0, 1, 0, 0, None, "processing_template")
             await sse_manager.send_log(job_id, "DEBUG", f"Template loaded: {template['name']} v{template['version']}")
 
-            # 4. Replace placeholders using same method as bulk generation
-            from app.services.image_processor import replace_placeholders as replace_placeholders_bulk
-            from app.services.html_to_image import convert_html_to_png
-            
-            # Template HTML already uses {placeholder} format
-            template_html = template['html_content']
-            
-            # Use bulk generation's replace_placeholders (handles nested data via flattening)
-            # Flatten nested data: overlay.fill_color becomes overlay_fill_color
-            flattened_data = {}
-            def flatten_dict(d, parent_key=''):
-                for k, v in d.items():
-                    new_key = f"{parent_key}_{k}" if parent_key else k
-                    if isinstance(v, dict):
-                        flatten_dict(v, new_key)
-                    else:
-                        flattened_data[new_key] = v
-            
-            flatten_dict(custom_data)
-            
-            # Replace placeholders
-            filled_html = replace_placeholders_bulk(template_html, flattened_data)
-            
-            print(f"[TEMPLATE] Template HTML prepared for rendering (section: {section})")
-            
-            # Send progress - 50% (rendering)
+        # 4. Replace placeholders using same method as bulk generation
+        # Template HTML already uses {placeholder} format
+        template_html = template['html_content']
+        
+        # Use bulk generation's replace_placeholders (handles nested data via flattening)
+        # Flatten nested data: overlay.fill_color becomes overlay_fill_color
+        flattened_data = _flatten_dict(custom_data)
+        
+        # Replace placeholders
+        filled_html = replace_placeholders_bulk(template_html, flattened_data)
+        
+        logger.debug("Template HTML prepared for rendering", section=section)
+        
+        # Send progress - 50% (rendering)
+        async with sse_manager.batch(job_id):
             await sse_manager.send_progress(job_id, 0, 1, 0, 0, None, "rendering")
             await sse_manager.send_log(job_id, "INFO", "Rendering poster image...")
 
-            # 5. Render to image using dimensions from template
-            dimensions = {
-                'width': template.get('width') or 1080,
-                'height': template.get('height') or 1080
-            }
-            
-            print(f"[TEMPLATE] Rendering poster: {section} ({dimensions['width']}x{dimensions['height']}, entity_id: {custom_data.get('testimonial_id') or metadata.get('id', 'unknown')})")
-            image_bytes = await convert_html_to_png(
-                html=filled_html,
-                dimensions=dimensions
-            )
-            
-            # Send progress - 80% (uploading)
+        # 5. Render to image using dimensions from template
+        dimensions = {
+            'width': template.get('width') or 1080,
+            'height': template.get('height') or 1080
+        }
+        
+        logger.debug(
+            "Rendering template poster",
+            section=section,
+            width=dimensions['width'],
+            height=dimensions['height'],
+            entity_id=custom_data.get('testimonial_id') or metadata.get('id', 'unknown')
+        )
+        image_bytes = await convert_html_to_png(
+            html=filled_html,
+            dimensions=dimensions
+        )
+        
+        # 6. Upload to S3, sending progress - 80% (uploading) while it runs
+        entity_id = custom_data.get('testimonial_id') or metadata.get('id', 'unknown')
+        s3_key = generate_s3_key(section, str(entity_id))
+        upload_task = asyncio.create_task(upload_to_s3(image_bytes, s3_key))
+        async with sse_manager.batch(job_id):
             await sse_manager.send_progress(job_id, 0, 1, 0, 0, None, "uploading")
             await sse_manager.send_log(job_id, "INFO", "Uploading to storage...")
+        s3_url = await upload_task
+        logger.debug("Template poster uploaded to S3", url=s3_url)
 
-            # 6. Upload to S3
-            entity_id = custom_data.get('testimonial_id') or metadata.get('id', 'unknown')
-            s3_key = generate_s3_key(section, str(entity_id))
-            s3_url = await upload_to_s3(image_bytes, s3_key)
-            print(f"[TEMPLATE] Uploaded to S3: {s3_url}")
+        # 7. Calculate generation time
+        generation_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
 
-            # 7. Calculate generation time
-            generation_time_ms = int((time.time() - start_time) * 1000)
-
-            # 8. Log to template_poster_results
-            import json
-            await conn.execute(
-                """
-                INSERT INTO template_poster_results
-                (job_id, template_id, entity_id, custom_data, output_url, s3_key, status, template_version, generation_time_ms, metadata)
-                VALUES ($1, $2, $3, $4::jsonb, $5, $6, $7, $8, $9, $10::jsonb)
-                """,
-                job_id,
-                template['id'],
-                str(entity_id),
-                json.dumps(custom_data),
-                s3_url,
-                s3_key,
-                'completed',
-                template['version'],
-                generation_time_ms,
-                json.dumps(metadata)
-            )
-            
-            # Send progress - 100% (completed)
-            await sse_manager.send_progress(job_id, 1, 1, 1, 0, str(entity_id), "completed")
-            await sse_manager.send_log(job_id, "INFO", f"Generation completed in {generation_time_ms}ms")
+        # 8. Log to template_poster_results; the row must be committed before
+        # completion is announced, since clients then read it back
+        await database_service.add_template_result(
+            job_id=job_id,
+            template_id=template['id'],
+            entity_id=str(entity_id),
+            custom_data=custom_data,
+            output_url=s3_url,
+            s3_key=s3_key,
+            status='completed',
+            template_version=template['version'],
+            generation_time_ms=generation_time_ms,
+            metadata=metadata
+        )
 
-            # 9. Send poster completed via SSE
-            await sse_manager.send_poster_completed(
+        # 9. Send progress - 100% (completed) and poster completed via SSE
+        await sse_manager.send_batch(job_id, [
+            sse_manager.progress_event(job_id, 1, 1, 1, 0, str(entity_id), "completed"),
+            sse_manager.log_event(job_id, "INFO", f"Generation completed in {generation_time_ms}ms"),
+            sse_manager.poster_completed_event(
                 job_id=job_id,
                 username=str(entity_id),
                 poster_url=s3_url,
                 success=True
             )
+        ])
 
         logger.info("TaskIQ: Template poster completed", job_id=job_id, url=s3_url, time_ms=generation_time_ms)
 
@@ -290,37 +333,22 @@ async def process_template_poster_task(
         error_msg = str(e)
         logger.error("TaskIQ: Template poster failed", job_id=job_id, error=error_msg)
 
-        # Log failure
+        # Log failure to template_poster_results and template_generation_logs
+        # in one round trip; retried in the background if the write fails
+        failed_row = (
+            job_id,
+            custom_data.get('testimonial_id', 'unknown'),
+            custom_data,
+            error_msg,
+            metadata,
+            f"Failed to generate poster: {error_msg}"
+        )
         try:
-            import json
             async with database_service.connection() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO template_poster_results
-                    (job_id, entity_id, custom_data, status, error_message, metadata)
-                    VALUES ($1, $2, $3::jsonb, $4, $5, $6::jsonb)
-                    """,
-                    job_id,
-                    custom_data.get('testimonial_id', 'unknown'),
-                    json.dumps(custom_data),
-                    'failed',
-                    error_msg,
-                    json.dumps(metadata)
-                )
-
-                # Log to template_generation_logs
-                await conn.execute(
-                    """
-                    INSERT INTO template_generation_logs (job_id, level, message, details)
-                    VALUES ($1, $2, $3, $4::jsonb)
-                    """,
-                    job_id,
-                    'ERROR',
-                    f"Failed to generate poster: {error_msg}",
-                    json.dumps({'custom_data': custom_data, 'error': error_msg})
-                )
-        except:
-            pass
+                await conn.execute(_FAILED_RESULT_SQL, *failed_row)
+        except Exception as db_error:
+            logger.warning("Failed to log template failure, queued for retry", job_id=job_id, error=str(db_error))
+            _queue_failed_result(failed_row)
 
         # Send failure via SSE
         await sse_manager.send_poster_completed(
@@ -338,12 +366,52 @@ async def process_template_poster_task(
         }
 
 
+def _queue_failed_result(row: tuple):
+    """Queue a failure row for background retry, starting the writer if needed"""
+    global _failed_results_task
+    try:
+        _failed_results.put_nowait(row)
+    except asyncio.QueueFull:
+        logger.error("Failure retry queue full, dropping row", job_id=row[0], error=row[3])
+        return
+
+    if _failed_results_task is None or _failed_results_task.done():
+        _failed_results_task = asyncio.create_task(_drain_failed_results())
+
+
+async def _drain_failed_results():
+    """Write queued failure rows in batches, backing off while the database is unavailable"""
+    while not _failed_results.empty():
+        batch = []
+        while len(batch) < FAILED_RESULT_BATCH_SIZE and not _failed_results.empty():
+            batch.append(_failed_results.get_nowait())
+
+        delay = FAILED_RESULT_RETRY_DELAY
+        for attempt in range(1, FAILED_RESULT_MAX_ATTEMPTS + 1):
+            await asyncio.sleep(delay)
+            try:
+                async with database_service.connection() as conn:
+                    await conn.executemany(_FAILED_RESULT_SQL, batch)
+                logger.info("Wrote queued template failures", count=len(batch))
+                break
+            except Exception as e:
+                logger.warning("Retrying queued template failures", count=len(batch), attempt=attempt, error=str(e))
+                delay *= 2
+        else:
+            logger.error(
+                "Dropping queued template failures",
+                count=len(batch),
+                job_ids=sorted({row[0] for row in batch})
+            )
+
+
 @broker.task(task_name="process_batch_template_job")
 async def process_batch_template_job_task(
     job_id: str,
     template_id: str,
     items: List[Dict[str, Any]],
-    metadata: Dict[str, Any]
+    metadata: Dict[str, Any],
+    template_uuid: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     TaskIQ task to process batch template poster generation
@@ -354,6 +422,8 @@ async def process_batch_template_job_task(
         template_id: Template identifier (e.g., 'testimonial_latest')
         items: List of custom_data dicts for each poster
         metadata: Additional job metadata
+        template_uuid: Template row resolved by the caller; the section's
+            active template is looked up once when omitted
 
     Returns:
         Job summary
@@ -364,6 +434,14 @@ async def process_batch_template_job_task(
         # Ensure services are initialized
         await ensure_services_initialized()
 
+        # Pin every item to one template row so an activation mid-batch
+        # can't mix versions, and workers can serve it from the id cache
+        if not template_uuid:
+            template = await get_active_template(parse_template_id(template_id))
+            if not template:
+                raise Exception(f"No active template found for '{template_id}'")
+            template_uuid = str(template['id'])
+
         async with database_service.connection() as conn:
             # Update job status to processing
             await conn.execute(
@@ -378,22 +456,26 @@ async def process_batch_template_job_task(
             # Send log
             await sse_manager.send_log(job_id, "INFO", f"Processing {len(items)} template posters in parallel")
 
-            # Publish each item to RedPanda for parallel processing
-            for idx, item in enumerate(items):
-                try:
-                    await redpanda_client.publish_job(
-                        job_id=f"{job_id}_item_{idx}",
-                        job_data={
-                            "parent_job_id": job_id,
-                            "type": "template_poster",
-                            "template_id": template_id,
-                            "custom_data": item,
-                            "metadata": metadata,
-                            "index": idx
-                        }
-                    )
-                except Exception as e:
-                    logger.error("Failed to publish item", job_id=job_id, index=idx, error=str(e))
+            # Publish all items to RedPanda in one batch (single wait for acks)
+            publish_results = await redpanda_client.publish_jobs_batch([
+                (
+                    f"{job_id}_item_{idx}",
+                    {
+                        "parent_job_id": job_id,
+                        "type": "template_poster",
+                        "template_id": template_id,
+                        "template_uuid": template_uuid,
+                        "custom_data": item,
+                        "metadata": metadata,
+                        "index": idx
+                    }
+                )
+                for idx, item in enumerate(items)
+            ])
+
+            for idx, published in enumerate(publish_results):
+                if not published:
+                    logger.error("Failed to publish item", job_id=job_id, index=idx)
 
             logger.info("TaskIQ: All items published to RedPanda", job_id=job_id)
 
@@ -444,23 +526,37 @@ async def cleanup_old_jobs_task():
 
 
 # In-memory job storage for single poster generation (shared across modules)
-_ai_poster_jobs: dict = {}
+# LRU with TTL, so finished jobs and their variant HTML are eventually dropped
+AI_POSTER_JOB_TTL_SECONDS = 3600
+AI_POSTER_JOB_MAX_SIZE = 10_000
+_ai_poster_jobs: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
 
 
 def get_ai_poster_job(job_id: str) -> dict | None:
     """Get AI poster job status"""
-    return _ai_poster_jobs.get(job_id)
+    entry = _ai_poster_jobs.get(job_id)
+    if entry is None:
+        return None
+    expires_at, data = entry
+    if expires_at < time.monotonic():
+        _ai_poster_jobs.pop(job_id, None)
+        return None
+    return data
 
 
 def set_ai_poster_job(job_id: str, data: dict):
-    """Set AI poster job status"""
-    _ai_poster_jobs[job_id] = data
+    """Set AI poster job status, evicting the oldest jobs when full"""
+    _ai_poster_jobs[job_id] = (time.monotonic() + AI_POSTER_JOB_TTL_SECONDS, data)
+    _ai_poster_jobs.move_to_end(job_id)
+    while len(_ai_poster_jobs) > AI_POSTER_JOB_MAX_SIZE:
+        _ai_poster_jobs.popitem(last=False)
 
 
 def update_ai_poster_job(job_id: str, **updates):
     """Update AI poster job status"""
-    if job_id in _ai_poster_jobs:
-        _ai_poster_jobs[job_id].update(updates)
+    data = get_ai_poster_job(job_id)
+    if data is not None:
+        data.update(updates)
 
 
 @broker.task(task_name="process_ai_poster_generation")
@@ -472,20 +568,15 @@ async def process_ai_poster_generation_task(
     TaskIQ task for async AI poster generation with SSE progress updates.
     Generates 3 variants concurrently for faster results.
     """
-    import asyncio
-    from datetime import datetime
-    from typing import Dict, Optional
-    
     try:
         logger.info("TaskIQ: Starting AI poster generation", job_id=job_id)
-        print(f"\n🔵 [TASKIQ] AI Poster generation started: {job_id}\n")
         
         # Ensure services are initialized
         await ensure_services_initialized()
         
-        # Wait for frontend SSE connection to establish
-        # This gives time for the HTTP response to be sent and SSE connection to be made
-        await asyncio.sleep(1.0)
+        # Wait (briefly) for the frontend SSE connection so early events are not lost
+        if not await sse_manager.wait_ready(job_id, timeout=2):
+            logger.debug("No SSE client connected yet, continuing", job_id=job_id)
         
         # Send initial progress
         await sse_manager.send_progress(job_id, 0, 3, 0, 0, None, "starting")
@@ -497,31 +588,7 @@ async def process_ai_poster_generation_task(
         model = request_data.get("model", "flash")
         user_mode = request_data.get("userMode", "admin")
         
-        # Fetch Topmate profile
-        await sse_manager.send_log(job_id, "INFO", f"Fetching profile for @{config['topmateUsername']}...")
-        await sse_manager.send_progress(job_id, 0, 3, 0, 0, None, "fetching_profile")
-        
-        try:
-            from app.services.topmate_client import fetch_topmate_profile
-            profile = await fetch_topmate_profile(config["topmateUsername"])
-        except Exception as e:
-            await sse_manager.send_job_failed(job_id, f"Failed to fetch profile: {str(e)}")
-            update_ai_poster_job(job_id, status="failed", error=str(e))
-            return {"success": False, "error": str(e)}
-        
-        await sse_manager.send_log(job_id, "INFO", f"Profile loaded: {profile.display_name}")
-        
         # Get dimensions
-        POSTER_SIZE_DIMENSIONS = {
-            "instagram-square": {"width": 1080, "height": 1080},
-            "instagram-portrait": {"width": 1080, "height": 1350},
-            "instagram-story": {"width": 1080, "height": 1920},
-            "linkedin-post": {"width": 1200, "height": 1200},
-            "twitter-post": {"width": 1200, "height": 675},
-            "facebook-post": {"width": 1200, "height": 630},
-            "a4-portrait": {"width": 2480, "height": 3508}
-        }
-        
         if config.get("size") == "custom" and config.get("customDimensions"):
             dimensions = config["customDimensions"]
         else:
@@ -539,27 +606,47 @@ async def process_ai_poster_generation_task(
         
         await sse_manager.send_log(job_id, "DEBUG", f"Using model: {model_id}")
         
+        # Creative direction for Strategy C only needs the prompt, so it
+        # runs while the profile is being fetched
+        creative_task = None
+        if not reference_image:
+            creative_task = asyncio.create_task(
+                _get_creative_direction(model=model_id, prompt=config["prompt"])
+            )
+        
+        # Fetch Topmate profile
+        await sse_manager.send_log(job_id, "INFO", f"Fetching profile for @{config['topmateUsername']}...")
+        await sse_manager.send_progress(job_id, 0, 3, 0, 0, None, "fetching_profile")
+        
+        try:
+            profile = await fetch_topmate_profile(config["topmateUsername"])
+        except Exception as e:
+            if creative_task:
+                creative_task.cancel()
+            await sse_manager.send_job_failed(job_id, f"Failed to fetch profile: {str(e)}")
+            update_ai_poster_job(job_id, status="failed", error=str(e))
+            return {"success": False, "error": str(e)}
+        
+        await sse_manager.send_log(job_id, "INFO", f"Profile loaded: {profile.display_name}")
+        
         # Get creative direction for Strategy C
         await sse_manager.send_progress(job_id, 0, 3, 0, 0, None, "analyzing_prompt")
         await sse_manager.send_log(job_id, "INFO", "Analyzing creative direction...")
         
-        creative_direction = None
-        if not reference_image:
-            creative_direction = await _get_creative_direction(model=model_id, prompt=config["prompt"])
+        creative_direction = await creative_task if creative_task else None
         
         # Build strategies
-        from app.services.prompts import POSTER_STRATEGIES, POSTER_SYSTEM_PROMPT, build_creative_directive, FALLBACK_CREATIVE_DIRECTIVE
-        from app.services.openrouter_client import call_openrouter
-        
-        strategies = []
-        for strategy_template in POSTER_STRATEGIES:
-            strategy = strategy_template.copy()
-            if strategy["name"] == "ai-creative-director":
-                if creative_direction:
-                    strategy["directive"] = build_creative_directive(creative_direction)
-                else:
-                    strategy["directive"] = FALLBACK_CREATIVE_DIRECTIVE
-            strategies.append(strategy)
+        # Only the creative-director strategy gets a per-job directive; the
+        # others are used as-is (they are never mutated)
+        creative_directive = (
+            build_creative_directive(creative_direction) if creative_direction
+            else FALLBACK_CREATIVE_DIRECTIVE
+        )
+        strategies = [
+            {**strategy, "directive": creative_directive}
+            if strategy["name"] == "ai-creative-director" else strategy
+            for strategy in POSTER_STRATEGIES
+        ]
         
         # Generate 3 variants CONCURRENTLY for speed
         await sse_manager.send_progress(job_id, 0, 3, 0, 0, None, "generating")
@@ -616,8 +703,7 @@ CONTEXT DATA (use only if prompt specifically needs it):
                 )
 
                 # Clean HTML
-                html = html.replace("```html\n", "").replace("```html", "")
-                html = html.replace("```\n", "").replace("```", "").strip()
+                html = _HTML_FENCE_PATTERN.sub("", html).strip()
                 if not html.startswith("<!DOCTYPE"):
                     idx = html.find("<!DOCTYPE")
                     if idx != -1:
@@ -641,32 +727,60 @@ CONTEXT DATA (use only if prompt specifically needs it):
                     "strategyName": strategy["name"]
                 }
             except Exception as e:
-                logger.error(f"Variant {variant_idx} failed", error=str(e))
+                logger.error(
+                    "Variant generation failed",
+                    job_id=job_id,
+                    variant_index=variant_idx,
+                    strategy=strategy["name"],
+                    error=str(e),
+                )
                 return None
         
-        # Run all 3 variants concurrently
-        tasks = [generate_variant(idx, strategy) for idx, strategy in enumerate(strategies)]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Run all 3 variants concurrently, reporting each one as soon as it finishes
+        # Map each task back to its variant so failures can say which one broke
+        variants = {
+            asyncio.create_task(generate_variant(idx, strategy)): (idx, strategy["name"])
+            for idx, strategy in enumerate(strategies)
+        }
+        pending = set(variants)
         
-        # Collect successful posters
         posters = []
         success_count = 0
         failure_count = 0
+        processed = 0
         
-        for idx, result in enumerate(results):
-            if isinstance(result, Exception):
-                failure_count += 1
-                await sse_manager.send_log(job_id, "WARNING", f"Variant {idx + 1} failed: {str(result)}")
-            elif result is None:
-                failure_count += 1
-                await sse_manager.send_log(job_id, "WARNING", f"Variant {idx + 1} returned no result")
-            else:
-                success_count += 1
-                posters.append(result)
-                await sse_manager.send_log(job_id, "INFO", f"Variant {idx + 1} ({strategies[idx]['name']}) completed")
-            
-            # Send progress update
-            await sse_manager.send_progress(job_id, idx + 1, total_variants, success_count, failure_count, None, "generating")
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                processed += 1
+                variant_idx, strategy_name = variants[task]
+                try:
+                    result = task.result()
+                except Exception as e:
+                    result = None
+                    logger.error(
+                        "Variant generation raised",
+                        job_id=job_id,
+                        variant_index=variant_idx,
+                        strategy=strategy_name,
+                        error=str(e),
+                    )
+                
+                async with sse_manager.batch(job_id):
+                    if result is None:
+                        failure_count += 1
+                        await sse_manager.send_log(
+                            job_id, "WARNING",
+                            f"Variant {variant_idx + 1} ({strategy_name}) failed ({processed}/{total_variants} finished)"
+                        )
+                    else:
+                        success_count += 1
+                        posters.append(result)
+                        await sse_manager.send_log(job_id, "INFO", f"Variant {variant_idx + 1} ({strategy_name}) completed")
+                    await sse_manager.send_progress(job_id, processed, total_variants, success_count, failure_count, None, "generating")
+        
+        # Keep strategy order regardless of completion order
+        posters.sort(key=lambda poster: poster["variantIndex"])
         
         if not posters:
             error_msg = "All poster generations failed"
@@ -693,7 +807,7 @@ CONTEXT DATA (use only if prompt specifically needs it):
             "mode": "single"
         })
         
-        print(f"✅ [TASKIQ] AI Poster generation completed: {job_id}")
+        logger.info("TaskIQ: AI poster generation completed", job_id=job_id)
         return result
         
     except Exception as e:
@@ -707,10 +821,7 @@ CONTEXT DATA (use only if prompt specifically needs it):
 async def _get_creative_direction(model: str, prompt: str) -> dict | None:
     """Get creative direction from AI Creative Director"""
     try:
-        print("🎨 Getting creative direction from AI...")
-        from app.services.openrouter_client import call_openrouter
-        from app.services.prompts import CREATIVE_DIRECTOR_SYSTEM_PROMPT
-        import json
+        logger.debug("Getting creative direction from AI")
 
         user_prompt = f"""Analyze this poster/carousel request and provide creative direction:
 
@@ -732,21 +843,40 @@ Return ONLY a valid JSON object with your creative direction. No explanation, ju
 
         if start_idx != -1 and end_idx > start_idx:
             json_str = response[start_idx:end_idx]
-            direction = json.loads(json_str)
-            print(f"✅ Creative direction received: {direction.get('contentType', 'unknown')}")
+            direction = orjson.loads(json_str)
+            logger.debug("Creative direction received", content_type=direction.get('contentType', 'unknown'))
             return direction
 
-        print("⚠️ Could not parse creative direction JSON")
+        logger.warning("Could not parse creative direction JSON")
         return None
 
     except Exception as e:
-        print(f"❌ Creative direction failed: {e}")
+        logger.error("Creative direction failed", error=str(e))
         return None
 
 
+# Set once both services are up, so later tasks skip the health checks
+_services_ready = False
+_services_init_lock = asyncio.Lock()
+
+
 # Helper function to ensure services are initialized
 async def ensure_services_initialized():
     """Ensure database and RedPanda are initialized before processing tasks"""
+    global _services_ready
+    if _services_ready:
+        return
+
+    # Serialize cold-start initialization across concurrent tasks
+    async with _services_init_lock:
+        if _services_ready:
+            return
+        await _initialize_services()
+        _services_ready = database_service.is_healthy and redpanda_client.is_healthy
+
+
+async def _initialize_services():
+    """Initialize database and RedPanda if they are not healthy yet"""
     # Check if database is already initialized
     if not database_service.is_healthy:
         logger.info("TaskIQ: Initializing database...")
@@ -0,0 +1,23 @@
+"""
+TaskIQ Worker Entrypoint
+Runs the TaskIQ CLI with the uvloop event loop policy installed
+
+Usage: python -m app.worker worker app.tasks.poster_tasks:broker --fs-discover --workers 4
+"""
+import asyncio
+import sys
+
+# Only worker processes switch to the libuv-based loop; the API keeps the
+# default policy. Forked worker processes inherit it (uvloop is not
+# available on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+from taskiq.__main__ import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,31 +3,48 @@
 Apply new migrations to existing database
 Run this script to add template tables without recreating the entire database
 """
+import os
+import re
 import subprocess
 import sys
 
-def run_migration(migration_file, description):
-    """Apply a single migration file"""
-    print(f"\n📝 Applying {description}...")
+PSQL_CMD = [
+    "docker", "exec", "-i", "poster-postgres",
+    "psql", "-U", "postgres", "-d", "poster_generation"
+]
 
-    cmd = [
-        "docker", "exec", "-i", "poster-postgres",
-        "psql", "-U", "postgres", "-d", "poster_generation",
-        "-f", f"/migrations/{migration_file}"
-    ]
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# psql reports script errors as "psql:<stdin>:LINE: ERROR: ..."
+ERROR_LINE_PATTERN = re.compile(r'^psql:<stdin>:(\d+): (?:ERROR|FATAL):', re.MULTILINE)
+TABLES_MARKER = "::TABLES::"
+
+
+def build_script(migrations):
+    """
+    Concatenate all migrations into one psql script
+
+    Returns the script and each migration's (first_line, last_line) range,
+    so errors reported by line number can be attributed to a migration.
+    """
+    parts = []
+    ranges = []
+    line = 1
+    for migration_file, _ in migrations:
+        with open(os.path.join(MIGRATIONS_DIR, migration_file), encoding="utf-8") as f:
+            sql = f.read()
+        if not sql.endswith("\n"):
+            sql += "\n"
+        sql += f"\\echo ::DONE::{migration_file}\n"
+        line_count = sql.count("\n")
+        ranges.append((line, line + line_count - 1))
+        line += line_count
+        parts.append(sql)
+
+    # Verify tables in the same session
+    parts.append(f"\\echo {TABLES_MARKER}\n\\dt\n")
+    return "".join(parts), ranges
 
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=".")
-        if result.returncode == 0:
-            print(f"✓ {description} applied successfully")
-            return True
-        else:
-            print(f"✗ Error applying {description}:")
-            print(result.stderr)
-            return False
-    except Exception as e:
-        print(f"✗ Failed to run migration: {e}")
-        return False
 
 def main():
     print("=" * 60)
@@ -39,9 +56,45 @@ def main():
         ("004_create_template_jobs_schema.sql", "Template Jobs Schema (Migration 004)")
     ]
 
+    # Apply every migration (and the verification) in a single psql session
+    script, ranges = build_script(migrations)
+    try:
+        result = subprocess.run(
+            PSQL_CMD,
+            input=script.encode("utf-8"),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=65536,
+            cwd="."
+        )
+    except Exception as e:
+        print(f"✗ Failed to run migrations: {e}")
+        sys.exit(1)
+
+    # Decode psql output once instead of through a text wrapper
+    stdout = result.stdout.decode("utf-8", "replace")
+    stderr = result.stderr.decode("utf-8", "replace")
+
+    error_lines = [
+        (int(m.group(1)), line)
+        for m, line in (
+            (ERROR_LINE_PATTERN.match(line), line) for line in stderr.splitlines()
+        )
+        if m
+    ]
+
     success_count = 0
-    for migration_file, description in migrations:
-        if run_migration(migration_file, description):
+    for (migration_file, description), (first, last) in zip(migrations, ranges):
+        print(f"\n📝 Applying {description}...")
+        errors = [line for lineno, line in error_lines if first <= lineno <= last]
+        if f"::DONE::{migration_file}" not in stdout:
+            print(f"✗ Error applying {description}:")
+            print(stderr)
+        elif errors:
+            print(f"✗ Error applying {description}:")
+            print("\n".join(errors))
+        else:
+            print(f"✓ {description} applied successfully")
             success_count += 1
 
     print("\n" + "=" * 60)
@@ -53,24 +106,15 @@ def main():
 
     # Verify tables
     print("\n Verifying new tables...")
-    verify_cmd = [
-        "docker", "exec", "-i", "poster-postgres",
-        "psql", "-U", "postgres", "-d", "poster_generation",
-        "-c", "\\dt"
-    ]
-
-    try:
-        result = subprocess.run(verify_cmd, capture_output=True, text=True)
-        if "templates" in result.stdout:
-            print("\n✓ Template tables found:")
-            for line in result.stdout.split('\n'):
-                if any(word in line.lower() for word in ['template', 'poster_generation']):
-                    print(f"  {line}")
-        else:
-            print("\n⚠️  Could not verify tables")
-            print(result.stdout)
-    except Exception as e:
-        print(f"⚠️  Could not verify tables: {e}")
+    tables = stdout.split(TABLES_MARKER, 1)[-1]
+    if "templates" in tables:
+        print("\n✓ Template tables found:")
+        for line in tables.split('\n'):
+            if any(word in line.lower() for word in ['template', 'poster_generation']):
+                print(f"  {line}")
+    else:
+        print("\n⚠️  Could not verify tables")
+        print(tables)
 
     print("=" * 60)
 
@@ -11,58 +11,23 @@ with open(file_path, 'r', encoding='utf-8') as f:
 
 # Pattern to find: async with database_service.connection() as conn:\n\n        # (code at same level)
 # Should be: async with database_service.connection() as conn:\n            # (code indented one level)
+CONNECTION_BLOCK_PATTERN = re.compile(
+    r'^(?P<head>(?P<indent>[ \t]*)async with database_service\.connection\(\) as conn:\n)'
+    r'(?:[ \t]*\n)?'  # blank line left after the header
+    r'(?P<body>(?:(?P=indent)[ \t]*\n|(?P=indent)(?![ \t]).*\n)+)',
+    re.MULTILINE
+)
 
-lines = content.split('\n')
-fixed_lines = []
-in_async_with = False
-indent_level = 0
 
-i = 0
-while i < len(lines):
-    line = lines[i]
+def indent_block(match):
+    """Indent the lines left at the header's level by one level (4 spaces)"""
+    body = re.sub(r'^(?=[ \t]*\S)', '    ', match.group('body'), flags=re.MULTILINE)
+    return match.group('head') + body
 
-    # Check if this line is the async with statement
-    if 'async with database_service.connection() as conn:' in line:
-        fixed_lines.append(line)
-        in_async_with = True
-        # Calculate the base indent level
-        indent_level = len(line) - len(line.lstrip())
-        i += 1
 
-        # Skip empty line if present
-        if i < len(lines) and lines[i].strip() == '':
-            i += 1
-
-        # Indent all following lines until we hit a dedent
-        while i < len(lines):
-            next_line = lines[i]
-
-            # If we hit a line at the same or less indent level (except empty lines), stop indenting
-            if next_line.strip():
-                next_indent = len(next_line) - len(next_line.lstrip())
-                if next_indent <= indent_level:
-                    break
-
-            # Add 4 spaces of indentation if not already indented enough
-            if next_line.strip() and not next_line.startswith(' ' * (indent_level + 4)):
-                current_indent = len(next_line) - len(next_line.lstrip())
-                if current_indent == indent_level:
-                    # Need to indent this line
-                    fixed_lines.append(' ' * (indent_level + 4) + next_line.strip())
-                else:
-                    fixed_lines.append(next_line)
-            else:
-                fixed_lines.append(next_line)
-
-            i += 1
-
-        in_async_with = False
-        continue
-
-    fixed_lines.append(line)
-    i += 1
+content = CONNECTION_BLOCK_PATTERN.sub(indent_block, content)
 
 with open(file_path, 'w', encoding='utf-8') as f:
-    f.write('\n'.join(fixed_lines))
+    f.write(content)
 
 print("✅ Fixed indentation in templates.py")
@@ -6,18 +6,15 @@ Run this to quickly test if template generation works
 import requests
 import sys
 
+from _testutils import GENERATE_URL, check_health, loads, session
+
 print("\n🧪 QUICK TEMPLATE TEST\n")
 
 # Check backend
-try:
-    r = requests.get("http://localhost:8000/health", timeout=3)
-    if r.status_code != 200:
-        print("❌ Backend not healthy")
-        sys.exit(1)
-    print("✅ Backend running")
-except:
+if not check_health():
     print("❌ Backend not running (start with: cd backend && python run_server.py)")
     sys.exit(1)
+print("✅ Backend running")
 
 # Test generation
 payload = {
@@ -33,15 +30,15 @@ payload = {
 
 print("🎨 Generating poster...")
 try:
-    r = requests.post("http://localhost:8000/api/templates/generate", json=payload, timeout=120)
+    r = session.post(GENERATE_URL, json=payload, timeout=120)
     if r.status_code == 200:
-        result = r.json()
+        result = loads(r.content)
         print(f"✅ SUCCESS!")
         print(f"📍 URL: {result['url']}")
         print(f"⏱️  Time: {result.get('generation_time_ms')}ms")
     else:
         print(f"❌ FAILED: {r.status_code}")
-        print(r.json())
+        print(loads(r.content))
         sys.exit(1)
 except requests.exceptions.Timeout:
     print("⏰ Timeout - check backend logs")
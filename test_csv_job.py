@@ -1,7 +1,23 @@
 #!/usr/bin/env python3
 """Test script to create a CSV-based batch job"""
 import requests
-import time
+
+from _testutils import BACKEND_URL, loads, session
+
+
+def iter_sse_events(response):
+    """Yield (event, data) pairs from a text/event-stream response"""
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            if data_lines:
+                yield event, loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
 
 # Read files
 with open('test_csv_with_userid.csv', 'rb') as f:
@@ -12,8 +28,8 @@ with open('test_template.html', 'r', encoding='utf-8') as f:
 
 # Create batch job
 print("🚀 Creating CSV batch job...")
-response = requests.post(
-    'http://localhost:8000/api/batch/csv-jobs',
+response = session.post(
+    f'{BACKEND_URL}/api/batch/csv-jobs',
     files={
         'csvFile': ('test.csv', csv_content, 'text/csv')
     },
@@ -27,34 +43,38 @@ response = requests.post(
 )
 
 if response.status_code == 200:
-    data = response.json()
+    data = loads(response.content)
     print(f"✅ Job created: {data['jobId']}")
     print(f" Total items: {data['totalItems']}")
     print(f"🔗 SSE endpoint: {data['sseEndpoint']}")
 
     job_id = data['jobId']
 
-    # Wait and check status
+    # Follow the job's SSE stream until it completes
     print("\n⏳ Waiting for job to complete...")
-    for i in range(30):
-        time.sleep(2)
-        status_response = requests.get(f'http://localhost:8000/api/batch/jobs/{job_id}')
-        if status_response.status_code == 200:
-            status_data = status_response.json()
-            job = status_data['job']
-            print(f"[{i*2}s] Status: {job['status']} | Processed: {job['processed_items']}/{job['total_items']} | Success: {job['success_count']} | Failed: {job['failure_count']}")
+    try:
+        with session.get(f"{BACKEND_URL}{data['sseEndpoint']}", stream=True, timeout=(5, 60)) as stream:
+            for event, payload in iter_sse_events(stream):
+                if event in ('status', 'progress'):
+                    print(f"Status: {payload.get('status', payload.get('phase'))} | Processed: {payload['processed']}/{payload['total']} | Success: {payload['success_count']} | Failed: {payload['failure_count']}")
+                    if payload.get('status') not in ('completed', 'failed'):
+                        continue
+                    event = 'job_completed' if payload['status'] == 'completed' else 'job_failed'
+                elif event not in ('job_completed', 'job_failed'):
+                    continue
 
-            if job['status'] in ['completed', 'failed']:
-                print(f"\n✅ Job {job['status']}!")
-                if job['status'] == 'failed':
-                    print(f"❌ Error: {job.get('error_message', 'Unknown')}")
+                print(f"\n✅ Job {'completed' if event == 'job_completed' else 'failed'}!")
+                if event == 'job_failed':
+                    print(f"❌ Error: {payload.get('error', payload.get('error_message', 'Unknown'))}")
                 break
+    except requests.exceptions.Timeout:
+        print("⏰ No events for 60s, fetching results anyway")
 
     # Get results
     print("\n📋 Fetching results...")
-    results_response = requests.get(f'http://localhost:8000/api/batch/jobs/{job_id}/results')
+    results_response = session.get(f'{BACKEND_URL}/api/batch/jobs/{job_id}/results')
     if results_response.status_code == 200:
-        results_data = results_response.json()
+        results_data = loads(results_response.content)
         print(f"✅ Success: {results_data['successCount']}")
         print(f"❌ Failed: {results_data['failureCount']}")
 
@@ -2,40 +2,74 @@
 Advanced Test Script with Debugging
 Tests template generation with detailed logging
 """
+import argparse
+import logging
+import os
 import requests
-import json
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-# Configuration
-BACKEND_URL = "http://localhost:8000"
+import _testutils
+from _testutils import BATCH_HEALTH_URL, GENERATE_URL, TEMPLATES_URL, dumps_pretty, loads, session
+
+# Full request/response dumps are only emitted with --verbose
+log = logging.getLogger(__name__)
 
 def test_template_exists():
-    """Check if testimonial template exists"""
-    print("\n📋 Checking if template exists...")
+    """Check if testimonial template exists (returns (ok, report lines))"""
+    lines = ["\n📋 Checking if template exists..."]
     try:
-        response = requests.get(f"{BACKEND_URL}/api/templates?section=testimonial", timeout=10)
+        response = session.get(TEMPLATES_URL, params={"section": "testimonial"}, timeout=10)
         if response.status_code == 200:
-            data = response.json()
+            data = loads(response.content)
             templates = data.get('templates', [])
             active = data.get('active_template')
             
-            print(f"   Found {len(templates)} testimonial template(s)")
+            lines.append(f"   Found {len(templates)} testimonial template(s)")
             if active:
-                print(f"   ✅ Active template: {active['name']} (version {active['version']})")
-                return True
+                lines.append(f"   ✅ Active template: {active['name']} (version {active['version']})")
+                return True, lines
             else:
-                print(f"   ⚠️  No active template found")
-                return False
+                lines.append(f"   ⚠️  No active template found")
+                return False, lines
         else:
-            print(f"   ❌ Failed to fetch templates: {response.status_code}")
-            return False
+            lines.append(f"   ❌ Failed to fetch templates: {response.status_code}")
+            return False, lines
     except Exception as e:
-        print(f"   ❌ Error: {str(e)}")
-        return False
+        lines.append(f"   ❌ Error: {str(e)}")
+        return False, lines
 
-def test_generation():
-    """Test poster generation"""
+def show_poster(result):
+    """Print a generation result and download the poster to verify it"""
+    print(f"\n🎯 Generated Poster:")
+    print(f"   URL: {result['url']}")
+    print(f"   Template: {result.get('template_name')} (v{result.get('template_version_used')})")
+    print(f"   Generation time: {result.get('generation_time_ms')}ms")
+    
+    # Try to download the image
+    print(f"\n🖼️  Downloading image to verify...")
+    try:
+        img_response = session.get(result['url'], stream=True, timeout=10)
+        if img_response.status_code == 200:
+            # Stream to disk for inspection, counting bytes as they arrive
+            filename = f"test_testimonial_{int(time.time())}.png"
+            total = 0
+            with open(filename, 'wb') as f:
+                for chunk in img_response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+                    total += len(chunk)
+            print(f"   ✅ Image downloaded: {total / 1024:.2f} KB")
+            print(f"   💾 Saved as: {filename}")
+        else:
+            print(f"   ⚠️  Could not download: {img_response.status_code}")
+    except Exception as e:
+        print(f"   ❌ Download error: {str(e)}")
+    
+    return True
+
+def test_generation(reuse=False):
+    """Test poster generation (reuse: serve identical payloads from the local cache)"""
     print("\n🎨 Testing poster generation...")
     
     payload = {
@@ -57,13 +91,19 @@ def test_generation():
     
     print("\n📤 Sending request...")
     print(f"   Endpoint: /api/templates/generate")
-    print(f"   Payload: {json.dumps(payload, indent=2)}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("   Payload: %s", dumps_pretty(payload))
+    
+    cached = _testutils.load_cached_generation(payload) if reuse else None
+    if cached and 'url' in cached:
+        print(f"\n♻️  Reusing cached result for this payload (--reuse)")
+        return show_poster(cached)
     
     start = time.time()
     
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/templates/generate",
+        response = session.post(
+            GENERATE_URL,
             json=payload,
             timeout=120
         )
@@ -74,42 +114,28 @@ def test_generation():
         print(f"   Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = loads(response.content)
             print(f"\n✅ SUCCESS!")
-            print(f"\n Result:")
-            print(json.dumps(result, indent=2))
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("\n Result:\n%s", dumps_pretty(result))
             
-            if 'url' in result:
-                print(f"\n🎯 Generated Poster:")
-                print(f"   URL: {result['url']}")
-                print(f"   Template: {result.get('template_name')} (v{result.get('template_version_used')})")
-                print(f"   Generation time: {result.get('generation_time_ms')}ms")
-                
-                # Try to download the image
-                print(f"\n🖼️  Downloading image to verify...")
-                try:
-                    img_response = requests.get(result['url'], timeout=10)
-                    if img_response.status_code == 200:
-                        size_kb = len(img_response.content) / 1024
-                        print(f"   ✅ Image downloaded: {size_kb:.2f} KB")
-                        
-                        # Save locally for inspection
-                        filename = f"test_testimonial_{int(time.time())}.png"
-                        with open(filename, 'wb') as f:
-                            f.write(img_response.content)
-                        print(f"   💾 Saved as: {filename}")
-                    else:
-                        print(f"   ⚠️  Could not download: {img_response.status_code}")
-                except Exception as e:
-                    print(f"   ❌ Download error: {str(e)}")
-                
-                return True
+            # The job is only queued; wait for the worker to upload the poster
+            print(f"\n⏳ Waiting for job {result['job_id']}...")
+            url = _testutils.wait_for_poster(result['poll_endpoint'])
+            poster = {
+                'url': url,
+                'template_name': result.get('template_name'),
+                'template_version_used': result.get('template_version'),
+                'generation_time_ms': int((time.time() - start) * 1000)
+            }
+            _testutils.store_generation(payload, poster)
+            return show_poster(poster)
         else:
             print(f"\n❌ FAILED!")
             try:
-                error = response.json()
+                error = loads(response.content)
                 print(f"\n📄 Error Response:")
-                print(json.dumps(error, indent=2))
+                print(dumps_pretty(error))
             except:
                 print(f"   {response.text}")
             return False
@@ -119,65 +145,70 @@ def test_generation():
         return False
     except Exception as e:
         print(f"\n💥 ERROR: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        # Full tracebacks only when TEST_DEBUG is set
+        if os.environ.get("TEST_DEBUG"):
+            import traceback
+            traceback.print_exc()
         return False
 
 def check_health():
-    """Check backend health"""
-    print("\n🏥 Checking backend health...")
-    try:
-        response = requests.get(f"{BACKEND_URL}/health", timeout=5)
-        if response.status_code == 200:
-            print("   ✅ Backend is healthy")
-            return True
-        print(f"   ⚠️  Status: {response.status_code}")
-        return False
-    except:
-        print("   ❌ Backend not responding")
-        return False
+    """Check backend health (returns (ok, report lines))"""
+    lines = ["\n🏥 Checking backend health..."]
+    if _testutils.check_health():
+        lines.append("   ✅ Backend is healthy")
+        return True, lines
+    lines.append("   ❌ Backend not responding")
+    return False, lines
 
 def check_services():
-    """Check batch processing services"""
-    print("\n🔧 Checking services...")
+    """Check batch processing services (returns (ok, report lines))"""
+    lines = ["\n🔧 Checking services..."]
     try:
-        response = requests.get(f"{BACKEND_URL}/api/batch/health", timeout=5)
+        response = session.get(BATCH_HEALTH_URL, timeout=5)
         if response.status_code == 200:
-            data = response.json()
+            data = loads(response.content)
             services = data.get('services', {})
-            print(f"   Database: {'✅' if services.get('database') else '❌'}")
-            print(f"   RedPanda: {'✅' if services.get('redpanda') else '❌'}")
-            print(f"   SSE Connections: {services.get('sse_connections', 0)}")
-            return data.get('success', False)
-        return False
+            lines.append(f"   Database: {'✅' if services.get('database') else '❌'}")
+            lines.append(f"   RedPanda: {'✅' if services.get('redpanda') else '❌'}")
+            lines.append(f"   SSE Connections: {services.get('sse_connections', 0)}")
+            return data.get('success', False), lines
+        return False, lines
     except:
-        print("   ⚠️  Could not check services")
-        return False
+        lines.append("   ⚠️  Could not check services")
+        return False, lines
 
-def main():
+def main(reuse=False):
     print("\n" + "🚀 " * 30)
     print(" TEMPLATE GENERATION DEBUG TEST")
     print("🚀 " * 30)
     
-    # Step 1: Health check
-    if not check_health():
+    # Steps 1-3: health, services and template checks are independent,
+    # so run them concurrently, then print their reports in order
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        health = executor.submit(check_health)
+        services = executor.submit(check_services)
+        template = executor.submit(test_template_exists)
+
+    health_ok, health_lines = health.result()
+    _, services_lines = services.result()
+    template_ok, template_lines = template.result()
+    for lines in (health_lines, services_lines, template_lines):
+        print("\n".join(lines))
+
+    if not health_ok:
         print("\n❌ Backend is not running!")
         print("\nTo start the backend:")
         print("  cd backend")
         print("  python run_server.py")
         return False
     
-    # Step 2: Check services
-    check_services()
-    
-    # Step 3: Check template
-    if not test_template_exists():
+    if not template_ok:
         print("\n⚠️  Warning: No active testimonial template found")
         print("\nYou may need to upload a template first:")
         print("  POST /api/templates/upload")
     
     # Step 4: Test generation
-    success = test_generation()
+    success = test_generation(reuse=reuse)
     
     print("\n" + "=" * 60)
     if success:
@@ -189,5 +220,12 @@ def main():
     return success
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description="Template generation debug test")
+    parser.add_argument("--verbose", action="store_true", help="dump full request/response JSON")
+    parser.add_argument("--reuse", action="store_true", help="reuse a cached result for an identical payload")
+    args = parser.parse_args()
+    logging.basicConfig(format="%(message)s")
+    log.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+
+    success = main(reuse=args.reuse)
     sys.exit(0 if success else 1)
@@ -2,13 +2,16 @@
 Test Script for Template Generation API
 Tests the /api/templates/generate endpoint with testimonial data
 """
+import argparse
+import os
 import requests
-import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from _testutils import BACKEND_URL, GENERATE_URL, dumps_pretty, fetch_png, loads, session, check_health, wait_for_poster
 
 # Configuration
-BACKEND_URL = "http://localhost:8000"
-ENDPOINT = f"{BACKEND_URL}/api/templates/generate"
+ENDPOINT = GENERATE_URL
 
 # Test data matching your request
 test_payload = {
@@ -36,13 +39,13 @@ def test_template_generation():
     
     print(f"\n📍 Endpoint: {ENDPOINT}")
     print(f"\n📦 Payload:")
-    print(json.dumps(test_payload, indent=2))
+    print(dumps_pretty(test_payload))
     
     print(f"\n⏳ Sending POST request...")
     start_time = time.time()
     
     try:
-        response = requests.post(
+        response = session.post(
             ENDPOINT,
             json=test_payload,
             headers={"Content-Type": "application/json"},
@@ -55,10 +58,10 @@ def test_template_generation():
         print(f"\n📡 Response Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = loads(response.content)
             print(f"\n✅ SUCCESS!")
             print(f"\n Response Data:")
-            print(json.dumps(result, indent=2))
+            print(dumps_pretty(result))
             
             if 'url' in result:
                 print(f"\n🖼️  Generated Poster URL:")
@@ -72,8 +75,8 @@ def test_template_generation():
             print(f"\n❌ FAILED!")
             print(f"\n📄 Response:")
             try:
-                error_data = response.json()
-                print(json.dumps(error_data, indent=2))
+                error_data = loads(response.content)
+                print(dumps_pretty(error_data))
             except:
                 print(response.text)
             
@@ -90,26 +93,72 @@ def test_template_generation():
         return False
     except Exception as e:
         print(f"\n💥 ERROR: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        # Full tracebacks only when TEST_DEBUG is set
+        if os.environ.get("TEST_DEBUG"):
+            import traceback
+            print(traceback.format_exc())
         return False
 
+def test_concurrent_generation(count):
+    """Send count generation requests concurrently over the shared session"""
+    print("\n" + "="*60)
+    print(f"🧪 TESTING {count} CONCURRENT GENERATIONS")
+    print("="*60)
+
+    def generate(_):
+        """Queue a generation and wait for it; return the poster URL, or None if it failed"""
+        try:
+            response = session.post(ENDPOINT, json=test_payload, timeout=30)
+            if response.status_code != 200:
+                return None
+            return wait_for_poster(loads(response.content)['poll_endpoint'])
+        except (requests.exceptions.RequestException, RuntimeError, TimeoutError):
+            return None
+
+    print(f"\n⏳ Sending {count} POST requests...")
+    start_time = time.time()
+
+    # Bounded by the shared session's connection pool size
+    with ThreadPoolExecutor(max_workers=min(count, 8)) as executor:
+        results = list(executor.map(generate, range(count)))
+
+    elapsed_time = time.time() - start_time
+    urls = [url for url in results if url]
+
+    print(f"\n⏱️  Total time: {elapsed_time:.2f}s ({elapsed_time / count:.2f}s per poster)")
+    print(f"   ✅ {len(urls)} succeeded, ❌ {count - len(urls)} failed")
+
+    # Download and check the posters in parallel (independent I/O)
+    print(f"\n📥 Verifying {len(urls)} posters...")
+    verified = 0
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(fetch_png, url) for url in urls]
+        for future in as_completed(futures):
+            try:
+                url, size, (width, height) = future.result()
+            except Exception as e:
+                print(f"   ❌ {e}")
+                continue
+            verified += 1
+            size_text = f"{size / 1024:.2f} KB" if size is not None else "size unknown"
+            print(f"   ✅ {width}x{height}, {size_text}: {url}")
+
+    return verified == count
+
 def check_backend_health():
     """Check if backend is running"""
     print("\n🏥 Checking backend health...")
-    try:
-        response = requests.get(f"{BACKEND_URL}/health", timeout=5)
-        if response.status_code == 200:
-            print("✅ Backend is healthy")
-            return True
-        else:
-            print(f"⚠️  Backend returned status {response.status_code}")
-            return False
-    except:
-        print("❌ Backend is not responding")
-        return False
+    if check_health():
+        print("✅ Backend is healthy")
+        return True
+    print("❌ Backend is not responding")
+    return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Template generation test")
+    parser.add_argument("--count", type=int, default=1, help="number of concurrent generations")
+    args = parser.parse_args()
+
     print("\n" + "🚀 "*30)
     print(" TEMPLATE GENERATION TEST SCRIPT")
     print("🚀 "*30)
@@ -122,7 +171,10 @@ if __name__ == "__main__":
         exit(1)
     
     # Run test
-    success = test_template_generation()
+    if args.count > 1:
+        success = test_concurrent_generation(args.count)
+    else:
+        success = test_template_generation()
     
     print("\n" + "="*60)
     if success:
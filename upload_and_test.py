@@ -1,20 +1,32 @@
 """
 Upload sample template and test generation
 """
-import requests
-import json
+import functools
+import os
 import time
 from pathlib import Path
 
-BACKEND_URL = "http://localhost:8000"
+from _testutils import GENERATE_URL, TEMPLATES_URL, UPLOAD_URL, loads, png_dimensions, session
+
+
+@functools.lru_cache(maxsize=4)
+def _load_template(path: str, mtime_ns: int) -> str:
+    """Read a template file (cached per path and modification time)"""
+    return Path(path).read_text(encoding="utf-8")
+
+
+def load_template(path: str) -> str:
+    """Read a template file, re-reading it only when it changes on disk"""
+    return _load_template(path, os.stat(path).st_mtime_ns)
+
 
 # Read template from file
-template_html = Path("sample_template_1080x1080.html").read_text()
+template_html = load_template("sample_template_1080x1080.html")
 
 # Upload template
 print("📤 Uploading template...")
-upload_response = requests.post(
-    f"{BACKEND_URL}/api/templates/upload",
+upload_response = session.post(
+    UPLOAD_URL,
     json={
         "section": "testimonial",
         "name": "Square Testimonial Card",
@@ -27,11 +39,12 @@ upload_response = requests.post(
             "testimonial_id": "123",
             "overlay_fill_color": "#3B82F6"
         }
-    }
+    },
+    timeout=30
 )
 
 if upload_response.status_code == 200:
-    result = upload_response.json()
+    result = loads(upload_response.content)
     print(f"✅ Template uploaded: {result['template_id']}")
     print(f"   Version: {result['version']}")
 else:
@@ -39,13 +52,23 @@ else:
     print(upload_response.text)
     exit(1)
 
-# Wait a bit
-time.sleep(2)
+# Wait until the new version is active (backoff from 50ms, up to 5s)
+deadline = time.monotonic() + 5.0
+delay = 0.05
+while time.monotonic() < deadline:
+    templates = loads(session.get(TEMPLATES_URL, params={"section": "testimonial"}, timeout=5).content)
+    active = templates.get("active_template") or {}
+    if active.get("version") == result["version"]:
+        break
+    time.sleep(delay)
+    delay = min(delay * 1.7, 0.4)
+else:
+    print("⚠️  Template not yet active after 5s")
 
 # Test generation
 print("\n🎨 Testing poster generation...")
-generate_response = requests.post(
-    f"{BACKEND_URL}/api/templates/generate",
+generate_response = session.post(
+    GENERATE_URL,
     json={
         "template_id": "testimonial_latest",
         "custom_data": {
@@ -66,7 +89,7 @@ generate_response = requests.post(
 )
 
 if generate_response.status_code == 200:
-    result = generate_response.json()
+    result = loads(generate_response.content)
     print(f"✅ Poster generated!")
     print(f"   URL: {result['url']}")
     print(f"   Template: {result['template_name']} (v{result['template_version_used']})")
@@ -74,22 +97,28 @@ if generate_response.status_code == 200:
     
     # Download and check dimensions
     print("\n📥 Downloading image...")
-    img_response = requests.get(result['url'])
+    img_response = session.get(result['url'], stream=True, timeout=10)
     if img_response.status_code == 200:
         img_path = f"generated_poster_{int(time.time())}.png"
+        # Stream straight to disk instead of buffering the whole PNG
         with open(img_path, 'wb') as f:
-            f.write(img_response.content)
+            for chunk in img_response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
         print(f"   Saved: {img_path}")
         
-        # Check dimensions
-        from PIL import Image
-        img = Image.open(img_path)
-        print(f"   Size: {img.size[0]}x{img.size[1]}")
+        # Check dimensions from the PNG IHDR chunk (no image decode needed)
+        with open(img_path, 'rb') as f:
+            dimensions = png_dimensions(f.read(24))
+        if dimensions is None:
+            print("\n❌ WARNING: Downloaded file is not a PNG")
+            exit(1)
+        width, height = dimensions
+        print(f"   Size: {width}x{height}")
         
-        if img.size == (1080, 1080):
+        if (width, height) == (1080, 1080):
             print("\n✅ SUCCESS! Image is 1080x1080")
         else:
-            print(f"\n❌ WARNING: Expected 1080x1080, got {img.size[0]}x{img.size[1]}")
+            print(f"\n❌ WARNING: Expected 1080x1080, got {width}x{height}")
 else:
     print(f"❌ Generation failed: {generate_response.status_code}")
     print(generate_response.text)